@@ -27,6 +27,14 @@ class LocalAutoGPTClient:
         if not self.ollama_service:
             raise Exception("Ollama service not available")
     
+    def ping(self, timeout: float = 1) -> bool:
+        """Cheap reachability check of the Ollama endpoint, without running the model"""
+        try:
+            response = requests.head(self.config.base_url, timeout=timeout)
+            return response.ok
+        except requests.RequestException:
+            return False
+    
     def _generate_text(self, prompt: str, timeout: int = None) -> str:
         """Generate text using Ollama with configurable timeout"""
         try:
@@ -34,7 +42,7 @@ class LocalAutoGPTClient:
             actual_timeout = timeout or self.config.timeout
             print(f"🤖 Generating text with {actual_timeout}s timeout...")
             
-            response = self.ollama_service._call_ollama(prompt)
+            response = self.ollama_service._call_ollama(prompt, timeout=actual_timeout)
             return response if response else "No response generated"
         except Exception as e:
             raise Exception(f"Text generation failed: {str(e)}")
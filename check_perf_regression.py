@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Check connection pool benchmark results for regressions
+
+Compares the last two "pool_perf" entries that test_database_pool.py appends
+to perf.jsonl and exits non-zero when the pooled speedup has dropped too far.
+"""
+
+import argparse
+import json
+import sys
+
+def load_entries(path, test_name):
+    """Return the entries for test_name from a JSON-lines file, oldest first"""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get('test') == test_name:
+                entries.append(entry)
+    return entries
+
+def check_regression(entries, max_drop, min_speedup):
+    """Return True if the latest entry is within limits"""
+    if not entries:
+        print("⚠️  No benchmark results to check")
+        return True
+    
+    latest = entries[-1]
+    speedup = latest['speedup']
+    print(f"📈 Latest speedup: {speedup:.2f}x (commit {latest.get('sha') or 'unknown'})")
+    
+    ok = True
+    if speedup < min_speedup:
+        print(f"❌ Speedup is below the {min_speedup:.2f}x minimum")
+        ok = False
+    
+    if len(entries) >= 2:
+        previous = entries[-2]['speedup']
+        drop = (previous - speedup) / previous
+        print(f"📊 Previous speedup: {previous:.2f}x ({-drop * 100:+.1f}%)")
+        if drop > max_drop:
+            print(f"❌ Speedup dropped by more than {max_drop * 100:.0f}%")
+            ok = False
+    
+    if ok:
+        print("✅ No performance regression")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Check pool benchmark results for regressions")
+    parser.add_argument('--path', default='perf.jsonl', help='Benchmark results file')
+    parser.add_argument('--test', default='pool_perf', help='Benchmark name to compare')
+    parser.add_argument('--max-drop', type=float, default=0.2,
+                        help='Largest allowed fractional drop in speedup between the last two runs')
+    parser.add_argument('--min-speedup', type=float, default=1.5,
+                        help='Smallest acceptable pooled-vs-direct speedup')
+    args = parser.parse_args()
+    
+    try:
+        entries = load_entries(args.path, args.test)
+    except FileNotFoundError:
+        print(f"⚠️  {args.path} not found; run test_database_pool.py first")
+        return True
+    
+    return check_regression(entries, args.max_drop, args.min_speedup)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
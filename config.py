@@ -150,6 +150,12 @@ CONFIG_DEFINITIONS = {
         'required': False,
         'default': '1800'
     },
+    'OLLAMA_CONCURRENCY': {
+        'description': 'Maximum concurrent Ollama requests for batch summaries',
+        'is_secret': False,
+        'required': False,
+        'default': '8'
+    },
     'DEFAULT_RESEARCH_QUESTION': {
         'description': 'Default research question for AI analysis',
         'is_secret': False,
@@ -477,6 +483,7 @@ SERPAPI_KEY = config.get('SERPAPI_KEY', required=True)
 OLLAMA_BASE_URL = config.get('OLLAMA_BASE_URL', 'http://localhost:11434')
 OLLAMA_MODEL = config.get('OLLAMA_MODEL', 'mistral:latest')
 OLLAMA_TIMEOUT = int(config.get('OLLAMA_TIMEOUT', '1800'))
+OLLAMA_CONCURRENCY = int(config.get('OLLAMA_CONCURRENCY', '8'))
 DEFAULT_RESEARCH_QUESTION = config.get('DEFAULT_RESEARCH_QUESTION', 'epigenetics and pre-diabetes')
 
 # AutoGPT Configuration
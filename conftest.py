@@ -0,0 +1,13 @@
+"""
+Pytest fixtures shared by the root-level test scripts.
+"""
+import pytest
+
+@pytest.fixture(scope='session')
+def pool():
+    """Global database connection pool, closed once the session (or xdist worker) ends."""
+    from models.database_pool import get_db_pool, close_db_pool
+    
+    db_pool = get_db_pool()
+    yield db_pool
+    close_db_pool()
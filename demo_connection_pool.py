@@ -66,24 +66,24 @@ def demonstrate_performance_comparison():
     
     def time_direct_connections():
         """Time using direct connections"""
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         for i in range(50):
             with db._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM leads")
                 cursor.fetchone()
-        return time.time() - start_time
+        return (time.monotonic_ns() - start_ns) / 1e9
     
     def time_pooled_connections():
         """Time using connection pool"""
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         pool = get_db_pool()
         for i in range(50):
             with pool.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM leads")
                 cursor.fetchone()
-        return time.time() - start_time
+        return (time.monotonic_ns() - start_ns) / 1e9
     
     # Run performance tests
     print("Running performance tests...")
@@ -1,4 +1,6 @@
+import copy
 import sqlite3
+from contextlib import closing, contextmanager
 from typing import List, Tuple, Optional, Dict, Any
 from config import DATABASE_PATH
 from datetime import datetime
@@ -11,9 +13,10 @@ except ImportError:
 
 # Import the connection pool
 try:
-    from models.database_pool import get_db_pool
+    from models.database_pool import get_db_pool, SingleConnectionPool
 except ImportError:
     get_db_pool = None
+    SingleConnectionPool = None
 
 class DatabaseConnection:
     def __init__(self, db_path: str = None):
@@ -223,6 +226,31 @@ class DatabaseConnection:
                 logger.error(f"Database connection error: {e}")
             raise
     
+    @contextmanager
+    def rollback_scope(self, name: str = 'rollback_scope'):
+        """
+        Yield a DatabaseConnection whose calls all share one connection inside a
+        SAVEPOINT that is rolled back on exit, so nothing written through it persists
+        
+        Usage:
+            with db.rollback_scope() as scoped_db:
+                lead_id = scoped_db.save_lead(...)
+        """
+        if self.pool:
+            connection_cm = self.pool.get_connection()
+        else:
+            connection_cm = closing(self._get_connection())
+        
+        with connection_cm as conn:
+            conn.execute(f'SAVEPOINT {name}')
+            scoped = copy.copy(self)
+            scoped.pool = SingleConnectionPool(conn)
+            try:
+                yield scoped
+            finally:
+                conn.execute(f'ROLLBACK TO SAVEPOINT {name}')
+                conn.execute(f'RELEASE SAVEPOINT {name}')
+    
     def save_lead(self, title: str, description: str, link: str, ai_summary: str, source: str = 'serp',
                   tags: str = None, company: str = None, institution: str = None,
                   contact_name: str = None, contact_email: str = None, contact_phone: str = None,
@@ -237,7 +265,11 @@ class DatabaseConnection:
                  contact_name, contact_email, contact_phone, contact_linkedin, contact_status, notes)
         
         if self.pool:
-            return self.pool.execute_update(query, params)
+            # execute_update returns the row count, not the new ID
+            with self.pool.get_connection() as conn:
+                c = conn.cursor()
+                c.execute(query, params)
+                return c.lastrowid
         else:
             # Fallback to direct connection
             with self._get_connection() as conn:
@@ -246,6 +278,57 @@ class DatabaseConnection:
                 conn.commit()
                 return c.lastrowid
     
+    def save_leads_bulk(self, leads: List[Dict[str, Any]]) -> int:
+        """
+        Save many leads in a single transaction
+        
+        Args:
+            leads: Lead dicts keyed like the save_lead() arguments
+            
+        Returns:
+            Number of leads inserted
+        """
+        if not leads:
+            return 0
+        
+        query = '''
+            INSERT INTO leads (title, description, link, ai_summary, source, tags, company, institution,
+                             contact_name, contact_email, contact_phone, contact_linkedin, contact_status, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        '''
+        params_list = [
+            (lead.get('title') or '', lead.get('description'), lead.get('link'), lead.get('ai_summary'),
+             lead.get('source', 'serp'), lead.get('tags'), lead.get('company'), lead.get('institution'),
+             lead.get('contact_name'), lead.get('contact_email'), lead.get('contact_phone'),
+             lead.get('contact_linkedin'), lead.get('contact_status', 'not_contacted'), lead.get('notes'))
+            for lead in leads
+        ]
+        
+        if self.pool:
+            with self.pool.get_connection() as conn:
+                # Pooled connections autocommit, so open one transaction for all rows; inside
+                # rollback_scope() the connection is already in one, so nest a savepoint instead
+                nested = conn.in_transaction
+                conn.execute('SAVEPOINT save_leads_bulk' if nested else 'BEGIN')
+                try:
+                    cursor = conn.executemany(query, params_list)
+                except Exception:
+                    if nested:
+                        conn.execute('ROLLBACK TO save_leads_bulk')
+                        conn.execute('RELEASE save_leads_bulk')
+                    else:
+                        conn.execute('ROLLBACK')
+                    raise
+                conn.execute('RELEASE save_leads_bulk' if nested else 'COMMIT')
+                return cursor.rowcount
+        else:
+            # Fallback to direct connection
+            with self._get_connection() as conn:
+                c = conn.cursor()
+                c.executemany(query, params_list)
+                conn.commit()
+                return c.rowcount
+    
     def get_all_leads(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get all leads from the database"""
         query = 'SELECT * FROM leads ORDER BY created_at DESC'
@@ -591,6 +674,29 @@ class DatabaseConnection:
                 result = c.fetchone()
                 return dict(result) if result else None
     
+    def get_leads_by_ids(self, lead_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get several leads by ID with one query per chunk, in the order requested"""
+        unique_ids = list(dict.fromkeys(lead_ids))
+        rows = []
+        
+        # Stay under SQLite's default limit of 999 bound parameters
+        for start in range(0, len(unique_ids), 900):
+            chunk = unique_ids[start:start + 900]
+            query = f"SELECT * FROM leads WHERE id IN ({','.join('?' * len(chunk))})"
+            params = tuple(chunk)
+            
+            if self.pool:
+                rows.extend(self.pool.execute_query(query, params))
+            else:
+                # Fallback to direct connection
+                with self._get_connection() as conn:
+                    c = conn.cursor()
+                    c.execute(query, params)
+                    rows.extend(dict(row) for row in c.fetchall())
+        
+        by_id = {row['id']: row for row in rows}
+        return [by_id[lead_id] for lead_id in lead_ids if lead_id in by_id]
+    
     # RAG-related methods
     def save_rag_chunk(self, chunk_id: str, doc_id: str, source: str, content_chunk: str, 
                       embedding_id: str = None, chunk_index: int = 0, total_chunks: int = 1, 
@@ -743,6 +849,57 @@ class DatabaseConnection:
                 'avg_confidence_score': 0.0
             }
 
+    def get_stats_version(self) -> tuple:
+        """
+        Get a cheap token that changes whenever the data behind the dashboard stats changes
+        
+        Combines row counts and latest update times of the lead, search and RAG tables
+        in a single query, so callers can cache aggregate statistics against it.
+        """
+        query = '''
+            SELECT
+                (SELECT COUNT(*) FROM leads) as leads,
+                (SELECT MAX(updated_at) FROM leads) as leads_updated,
+                (SELECT COUNT(*) FROM search_history) as searches,
+                (SELECT COUNT(*) FROM rag_document_chunks) as chunks,
+                (SELECT MAX(updated_at) FROM rag_document_chunks) as chunks_updated,
+                (SELECT COUNT(*) FROM rag_search_sessions) as sessions
+        '''
+        
+        if self.pool:
+            results = self.pool.execute_query(query)
+            return tuple(results[0].values()) if results else ()
+        else:
+            # Fallback to direct connection
+            with self._get_connection() as conn:
+                c = conn.cursor()
+                c.execute(query)
+                result = c.fetchone()
+                return tuple(result) if result else ()
+    
+    def get_stats_bundle(self) -> Dict[str, Any]:
+        """Get the lead, search and RAG totals shown on the dashboard in a single query"""
+        query = '''
+            SELECT
+                (SELECT COUNT(*) FROM leads) as total_leads,
+                (SELECT COUNT(*) FROM leads WHERE ai_summary IS NOT NULL AND ai_summary != '') as ai_analyses,
+                (SELECT COUNT(*) FROM search_history) as total_searches,
+                (SELECT COUNT(*) FROM rag_document_chunks) as total_chunks,
+                (SELECT COUNT(DISTINCT doc_id) FROM rag_document_chunks) as total_documents,
+                (SELECT COUNT(*) FROM rag_search_sessions) as total_sessions
+        '''
+        
+        if self.pool:
+            results = self.pool.execute_query(query)
+            return dict(results[0]) if results else {}
+        else:
+            # Fallback to direct connection
+            with self._get_connection() as conn:
+                c = conn.cursor()
+                c.execute(query)
+                result = c.fetchone()
+                return dict(result) if result else {}
+    
     def get_lead_stats(self) -> Dict[str, Any]:
         """Get lead statistics"""
         if self.pool:
@@ -1162,9 +1319,15 @@ def save_lead(title: str, description: str, link: str, ai_summary: str, source:
     return db.save_lead(title, description, link, ai_summary, source, tags, company, institution,
                        contact_name, contact_email, contact_phone, contact_linkedin, contact_status, notes)
 
+def save_leads_bulk(leads: List[Dict[str, Any]]) -> int:
+    return db.save_leads_bulk(leads)
+
 def get_all_leads(limit: Optional[int] = None) -> List[Dict[str, Any]]:
     return db.get_all_leads(limit)
 
+def get_leads_by_ids(lead_ids: List[int]) -> List[Dict[str, Any]]:
+    return db.get_leads_by_ids(lead_ids)
+
 def get_leads_by_source(source: str) -> List[Dict[str, Any]]:
     return db.get_leads_by_source(source)
 
@@ -1222,6 +1385,14 @@ def get_lead_stats() -> Dict[str, Any]:
     """Get lead statistics"""
     return db.get_lead_stats()
 
+def get_stats_bundle() -> Dict[str, Any]:
+    """Get dashboard lead, search and RAG totals in one query"""
+    return db.get_stats_bundle()
+
+def get_stats_version() -> tuple:
+    """Get a token that changes whenever the dashboard statistics change"""
+    return db.get_stats_version()
+
 # Researcher database functions
 def save_researcher(orcid_id: str, name: str, institution: str = None, 
                    department: str = None, bio: str = None, email: str = None,
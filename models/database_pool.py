@@ -77,7 +77,8 @@ class DatabaseConnectionPool:
                 self.db_path,
                 check_same_thread=False,  # Allow multi-threaded access
                 timeout=30.0,  # Connection timeout
-                isolation_level=None  # Auto-commit mode
+                isolation_level=None,  # Auto-commit mode
+                uri=self.db_path.startswith('file:')  # e.g. file:name?mode=memory&cache=shared
             )
             
             # Set SQLite pragmas for better performance
@@ -298,6 +299,28 @@ class DatabaseConnectionPool:
                     raise
                 time.sleep(0.1)  # Brief delay before retry
     
+    def warmup(self, count: int) -> int:
+        """
+        Pre-create connections until at least count are idle in the pool.
+        
+        Args:
+            count: Number of idle connections wanted (capped at max_connections)
+            
+        Returns:
+            Number of connections created
+        """
+        created = 0
+        with self._lock:
+            while self._pool.qsize() < count and self._active_connections < self.max_connections:
+                conn = self._create_connection()
+                if not conn:
+                    break
+                self._pool.put_nowait(conn)
+                self._active_connections += 1
+                self._total_connections_created += 1
+                created += 1
+        return created
+    
     def get_pool_stats(self) -> Dict[str, Any]:
         """Get connection pool statistics"""
         return {
@@ -322,6 +345,41 @@ class DatabaseConnectionPool:
         if logger:
             logger.info("All database connections closed")
 
+class SingleConnectionPool:
+    """
+    Pool-compatible wrapper that runs every query on one borrowed connection.
+    
+    Nothing is committed, so the caller keeps control of the surrounding
+    transaction (see DatabaseConnection.rollback_scope).
+    """
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+    
+    @contextmanager
+    def get_connection(self):
+        """Yield the borrowed connection"""
+        yield self._conn
+    
+    def execute_query(self, query: str, params: tuple = None) -> list:
+        """Execute a SELECT query and return results as dictionaries"""
+        cursor = self._conn.cursor()
+        cursor.execute(query, params or ())
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def execute_update(self, query: str, params: tuple = None) -> int:
+        """Execute an UPDATE, INSERT, or DELETE query without committing"""
+        cursor = self._conn.cursor()
+        cursor.execute(query, params or ())
+        return cursor.rowcount
+    
+    def execute_many(self, query: str, params_list: list) -> int:
+        """Execute the same query with multiple parameter sets without committing"""
+        cursor = self._conn.cursor()
+        cursor.executemany(query, params_list)
+        return cursor.rowcount
+
 # Global connection pool instance
 _db_pool = None
 
@@ -1,8 +1,10 @@
 from flask import Blueprint, render_template, jsonify
 from services.rag_generator import RAGGenerator
 from services.vector_store_service import VectorStoreService
-from models.database import get_rag_stats, get_lead_stats
+from models.database import get_stats_bundle, get_stats_version
+from functools import lru_cache
 import logging
+import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -10,6 +12,10 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 dashboard_bp = Blueprint('dashboard', __name__)
 
+# Dashboard stats are reused until the database changes, and at most this many seconds
+# (vector store totals are not covered by the database version)
+STATS_CACHE_TTL = 60
+
 @dashboard_bp.route('/')
 def index():
     """
@@ -93,14 +99,28 @@ def api_system_status():
 
 def get_dashboard_stats():
     """
-    Get comprehensive dashboard statistics
+    Get comprehensive dashboard statistics, cached against the database version
     """
     try:
-        # Get lead statistics
-        lead_stats = get_lead_stats()
-        
-        # Get RAG statistics
-        rag_stats = get_rag_stats()
+        version = get_stats_version()
+    except Exception as e:
+        logger.warning(f"Stats version unavailable, computing dashboard stats uncached: {e}")
+        return _compute_dashboard_stats()
+    
+    # Copy so callers can't modify the cached entry
+    return dict(_cached_dashboard_stats(version, int(time.time() // STATS_CACHE_TTL)))
+
+@lru_cache(maxsize=16)
+def _cached_dashboard_stats(version, time_bucket):
+    return _compute_dashboard_stats()
+
+def _compute_dashboard_stats():
+    """
+    Aggregate lead, RAG and vector store statistics
+    """
+    try:
+        # Get lead, search and RAG totals in one query
+        bundle = get_stats_bundle()
         
         # Get vector store statistics (with error handling)
         try:
@@ -122,10 +142,10 @@ def get_dashboard_stats():
         uptime = 99.8  # Placeholder
         
         # Ensure all values are numbers, not None
-        total_leads = lead_stats.get('total_leads', 0) or 0
-        total_searches = lead_stats.get('total_searches', 0) or 0
-        ai_analyses = lead_stats.get('ai_analyses', 0) or 0
-        rag_queries = rag_stats.get('total_sessions', 0) or 0
+        total_leads = bundle.get('total_leads', 0) or 0
+        total_searches = bundle.get('total_searches', 0) or 0
+        ai_analyses = bundle.get('ai_analyses', 0) or 0
+        rag_queries = bundle.get('total_sessions', 0) or 0
         
         return {
             'total_leads': total_leads,
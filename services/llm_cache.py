@@ -0,0 +1,107 @@
+"""
+LLM Response Cache
+
+This module caches text generation responses keyed by a SHA-256 hash of the
+model name and prompt, so identical prompts (workflow re-runs, the same lead
+returned by several search engines) skip the model round trip.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from utils.redis_cache import get_redis_cache_manager
+except ImportError:
+    get_redis_cache_manager = None
+
+try:
+    from utils.cache_manager import CacheManager
+except ImportError:
+    CacheManager = None
+
+try:
+    from utils.logger import get_logger
+    logger = get_logger('llm_cache')
+except ImportError:
+    logger = None
+
+class LLMCache:
+    """
+    Caching wrapper around a text generation function
+
+    Responses are stored in Redis when available (which itself falls back to
+    memory when the server is down), otherwise in a local CacheManager.
+    """
+
+    # ollama_service.generate_text reports failures as text; never cache those
+    ERROR_PREFIXES = ('AI service', 'AI generated an empty response')
+
+    def __init__(self, generate: Callable[[str], str],
+                 model_getter: Optional[Callable[[], Optional[str]]] = None,
+                 ttl: int = 3600, max_size: int = 1000, use_redis: bool = True):
+        """
+        Args:
+            generate: Function taking a prompt and returning generated text
+            model_getter: Returns the current model name, so switching models misses the cache
+            ttl: Time to live for cached responses in seconds
+            max_size: Maximum entries in the in-memory backend
+            use_redis: Use Redis when utils.redis_cache is importable
+        """
+        self._generate = generate
+        self._model_getter = model_getter
+        self.ttl = ttl
+
+        self._backend = None
+        if use_redis and get_redis_cache_manager:
+            try:
+                self._backend = get_redis_cache_manager()
+            except Exception as e:
+                if logger:
+                    logger.warning(f"Redis cache unavailable for LLM responses: {e}")
+        if self._backend is None and CacheManager:
+            self._backend = CacheManager(max_size=max_size, default_ttl=ttl)
+
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def make_key(self, prompt: str) -> str:
+        """Build the cache key for a prompt under the current model"""
+        model = self._model_getter() if self._model_getter else None
+        payload = json.dumps({'model': model, 'prompt': prompt}, sort_keys=True)
+        return f"llm:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def __call__(self, prompt: str) -> str:
+        """Generate text for a prompt, serving repeated prompts from the cache"""
+        if self._backend is None:
+            return self._generate(prompt)
+
+        key = self.make_key(prompt)
+        cached = self._backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self._stats['hits'] += 1
+            return cached
+
+        with self._lock:
+            self._stats['misses'] += 1
+
+        response = self._generate(prompt)
+        if response and not response.startswith(self.ERROR_PREFIXES):
+            self._backend.set(key, response, self.ttl)
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics"""
+        with self._lock:
+            hits = self._stats['hits']
+            misses = self._stats['misses']
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total * 100, 2) if total else 0,
+            'backend': type(self._backend).__name__ if self._backend else None,
+            'ttl': self.ttl
+        }
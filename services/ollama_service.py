@@ -412,12 +412,13 @@ Sammanfatta kort: företag, relevans för {research_question}"""
             logger.warning(f"Error parsing AI response: {e}")
             return False
     
-    def _call_ollama(self, prompt: str) -> Optional[str]:
+    def _call_ollama(self, prompt: str, timeout: Optional[float] = None) -> Optional[str]:
         """
         Make a call to Ollama API with optimized timeout and parameters
         
         Args:
             prompt: Prompt to send to Ollama
+            timeout: Request timeout in seconds (defaults to OLLAMA_TIMEOUT)
             
         Returns:
             Response text or None if failed
@@ -438,7 +439,7 @@ Sammanfatta kort: företag, relevans för {research_question}"""
         
         try:
             # Use configurable timeout
-            timeout = OLLAMA_TIMEOUT
+            timeout = timeout or OLLAMA_TIMEOUT
             response = self.session.post(self.api_url, json=payload, timeout=timeout)
             logger.debug(f"Ollama status: {response.status_code}")
             
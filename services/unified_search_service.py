@@ -10,6 +10,7 @@ This service consolidates all search functionality into a single, comprehensive
 """
 
 import time
+import threading
 from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -562,12 +563,16 @@ class UnifiedSearchService:
 
 # Global unified search service instance
 _unified_search_service = None
+_unified_search_service_lock = threading.Lock()
 
 def get_unified_search_service() -> UnifiedSearchService:
     """Get the global unified search service instance"""
     global _unified_search_service
     if _unified_search_service is None:
-        _unified_search_service = UnifiedSearchService()
+        # Checked again under the lock so concurrent first calls create a single instance
+        with _unified_search_service_lock:
+            if _unified_search_service is None:
+                _unified_search_service = UnifiedSearchService()
     return _unified_search_service
 
 # Health check for unified search service
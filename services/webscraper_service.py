@@ -7,9 +7,13 @@ Can be integrated with LangChain + LLM for analysis and structured data extracti
 """
 
 import asyncio
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from urllib.parse import urljoin, urlparse
 import re
 
@@ -20,11 +24,23 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 try:
-    from bs4 import BeautifulSoup
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup, Comment
     BEAUTIFULSOUP_AVAILABLE = True
 except ImportError:
     BEAUTIFULSOUP_AVAILABLE = False
 
+try:
+    import lxml  # noqa: F401 - only needed as the BeautifulSoup tree builder
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 try:
     from utils.logger import get_logger
     logger = get_logger('webscraper_service')
@@ -36,9 +52,61 @@ try:
 except ImportError:
     config = None
 
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Meta tags worth keeping; publisher pages often carry 100+ citation_* tags
+_META_WHITELIST = frozenset({
+    'description', 'keywords', 'author',
+    'citation_title', 'citation_author', 'citation_doi', 'citation_publication_date',
+    'og:title', 'og:description', 'twitter:title'
+})
+
+# Runs inside the page: collects text from the outermost elements matching
+# the selector (or the whole body), plus title, meta tags and the first links
+_EXTRACT_JS = """
+({selector, limit, metaNames}) => {
+    const clean = text => (text || '').replace(/\\s+/g, ' ').trim();
+    const parts = [];
+    let length = 0;
+    if (selector) {
+        for (const el of document.querySelectorAll(selector)) {
+            if (el.parentElement && el.parentElement.closest(selector)) continue;
+            const text = clean(el.innerText);
+            if (!text) continue;
+            parts.push(text);
+            length += text.length + 1;
+            if (length >= limit) break;
+        }
+    }
+    let content = parts.join(' ');
+    if (!content && document.body) content = clean(document.body.innerText);
+
+    const wanted = new Set(metaNames);
+    const metaTags = {};
+    for (const meta of document.querySelectorAll('meta[name], meta[property]')) {
+        const name = meta.getAttribute('name') || meta.getAttribute('property');
+        if (!wanted.has(name) || name in metaTags) continue;
+        const value = meta.getAttribute('content');
+        if (value) metaTags[name] = value;
+    }
+    const links = Array.from(document.querySelectorAll('a[href]'), a => a.getAttribute('href')).slice(0, 10);
+
+    return {title: document.title, content: content.slice(0, limit), metaTags, links};
+}
+"""
+
+# Tags whose contents are never useful text (scripts, inline SVG/MathML, embeds)
+_BLOB_TAGS = ['script', 'style', 'svg', 'math', 'noscript', 'iframe', 'img', 'template']
+
 @dataclass
 class ScrapedContent:
     """Container for scraped content"""
+    # Declared by hand (not slots=True) to keep Python 3.9 support
+    __slots__ = ('url', 'title', 'content', 'metadata', 'html', 'timestamp', 'source_type')
+    
     url: str
     title: str
     content: str
@@ -50,26 +118,270 @@ class ScrapedContent:
 @dataclass
 class ScrapingResult:
     """Result from web scraping operation"""
+    __slots__ = ('success', 'content', 'error', 'processing_time', 'source_url')
+    
     success: bool
     content: Optional[ScrapedContent]
     error: Optional[str]
     processing_time: float
     source_url: str
 
-class WebScraperService:
+class BrowserPool:
     """
-    Service for scraping scientific information from web pages
+    Long-lived Playwright browser with a pool of reusable pages
+    
+    Each page lives in its own browser context. Contexts are reused across
+    jobs with their cookies cleared, and the browser is shut down once no
+    page has been checked out for idle_timeout seconds. A semaphore of size
+    slots bounds checkouts; whoever holds a slot either takes an idle page or
+    opens a new one, so a context dropped on release is replaced on demand.
     """
     
-    def __init__(self):
+    LAUNCH_ARGS = [
+        '--no-sandbox',
+        '--disable-setuid-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-accelerated-2d-canvas',
+        '--no-first-run',
+        '--no-zygote',
+        '--disable-gpu',
+        '--disable-web-security',
+        '--disable-features=VizDisplayCompositor'
+    ]
+    
+    def __init__(self, size: int = 8, user_agent: Optional[str] = None,
+                 viewport: Optional[Dict[str, int]] = None,
+                 blocked_resource_types: Optional[set] = None,
+                 idle_timeout: float = 300):
+        self.size = size
+        self.user_agent = user_agent
+        self.viewport = viewport or {"width": 1920, "height": 1080}
+        self.blocked_resource_types = blocked_resource_types or set()
+        self.idle_timeout = idle_timeout
+        
+        self.playwright = None
         self.browser = None
-        self.page = None
+        self.loop = None  # Event loop the browser, queue and idle task are bound to
+        self.contexts = []
+        self._pages = None  # Idle pages
+        self._slots = None  # One per page that may be checked out at once
+        self._pages_created = 0
+        self._in_use = 0
+        self._last_used = 0.0
+        self._idle_task = None
+    
+    @property
+    def is_running(self) -> bool:
+        return self.browser is not None
+    
+    def touch(self):
+        """Reset the idle timer"""
+        self._last_used = time.monotonic()
+    
+    async def start(self):
+        """Launch the browser"""
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=True,
+            args=self.LAUNCH_ARGS
+        )
+        self.loop = asyncio.get_running_loop()
+        self._pages = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.size)
+        self._pages_created = 0
+        self._in_use = 0
+        self.touch()
+        self._idle_task = asyncio.ensure_future(self._watch_idle())
+    
+    async def acquire(self):
+        """Take an idle page, opening a new context if none is idle"""
+        slots = self._slots
+        if slots is None:
+            raise RuntimeError("Browser pool is not running")
+        self.touch()
+        await slots.acquire()
+        self._in_use += 1
+        try:
+            if self._slots is not slots:
+                raise RuntimeError("Browser pool was closed")
+            if not self._pages.empty():
+                return self._pages.get_nowait()
+            
+            # Holding a slot with no idle page means fewer than size pages exist
+            self._pages_created += 1
+            try:
+                context = await self.browser.new_context(
+                    user_agent=self.user_agent,
+                    viewport=self.viewport
+                )
+                # Don't download images, media, fonts or stylesheets
+                await context.route('**/*', self._route_request)
+                page = await context.new_page()
+            except Exception:
+                self._pages_created -= 1
+                raise
+            self.contexts.append(context)
+            return page
+        except BaseException:
+            self._in_use -= 1
+            slots.release()
+            raise
+    
+    async def release(self, page):
+        """Reset a page's context and return it to the pool"""
+        self.touch()
+        # Pages checked out before a close() (or a restart) have no slot here to give back
+        if page.context not in self.contexts:
+            return
+        
+        slots = self._slots
+        try:
+            try:
+                await page.context.clear_cookies()
+            except Exception as e:
+                # Drop the broken context; the slot freed below lets the next
+                # acquire() open a fresh one
+                if logger:
+                    logger.warning(f"Discarding browser context: {e}")
+                self._pages_created -= 1
+                if page.context in self.contexts:
+                    self.contexts.remove(page.context)
+                try:
+                    await page.context.close()
+                except Exception:
+                    pass
+                return
+            
+            if page.context in self.contexts:
+                self._pages.put_nowait(page)
+        finally:
+            if self._slots is slots:
+                self._in_use -= 1
+            slots.release()
+    
+    async def close(self):
+        """Close all contexts and the browser"""
+        if self._idle_task is not None and self._idle_task is not asyncio.current_task():
+            self._idle_task.cancel()
+        self._idle_task = None
+        
+        for context in self.contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                if logger:
+                    logger.warning(f"Error closing browser context: {e}")
+        self.contexts = []
+        self._pages = None
+        self._pages_created = 0
+        
+        # Wake tasks waiting for a slot; they see the pool closed and pass the wake-up on
+        slots, self._slots = self._slots, None
+        if slots is not None:
+            slots.release()
+        
+        try:
+            if self.browser:
+                await self.browser.close()
+        except Exception as e:
+            if logger:
+                logger.warning(f"Error closing browser: {e}")
+        self.browser = None
+        
+        try:
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            if logger:
+                logger.warning(f"Error stopping playwright: {e}")
         self.playwright = None
-        self._initialized = False
+    
+    async def _route_request(self, route):
+        """Abort requests for resources that are not needed for text extraction"""
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _watch_idle(self):
+        """Close the browser once it has been idle for idle_timeout seconds"""
+        while self.is_running:
+            await asyncio.sleep(min(self.idle_timeout, 60))
+            idle_for = time.monotonic() - self._last_used
+            if self._in_use == 0 and idle_for >= self.idle_timeout:
+                if logger:
+                    logger.info(f"Closing browser after {idle_for:.0f}s idle")
+                await self.close()
+                return
+
+# Shared browser pool, created on first use
+_browser_pool: Optional[BrowserPool] = None
+
+def get_browser_pool(**kwargs) -> BrowserPool:
+    """
+    Get the shared browser pool, creating it on first call
+    
+    Must be called from a coroutine. A pool started on another event loop
+    (e.g. by an earlier asyncio.run) cannot be used from this one, so it is
+    replaced with a fresh pool.
+    """
+    global _browser_pool
+    if _browser_pool is None or _browser_pool.loop not in (None, asyncio.get_running_loop()):
+        _browser_pool = BrowserPool(**kwargs)
+    return _browser_pool
+
+# Per-process service used by _parse_and_extract in pool workers
+_worker_service = None
+
+def _parse_and_extract(html: str, title: str, content_type: str, max_content_length: int) -> tuple:
+    """Extract content and metadata in a worker process"""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = WebScraperService()
+    _worker_service.max_content_length = max_content_length
+    return _worker_service._extract_from_html(html, title, content_type)
+
+class WebScraperService:
+    """
+    Service for scraping scientific information from web pages
+    """
+    
+    def __init__(self, max_concurrent: Optional[int] = None):
+        """
+        Args:
+            max_concurrent: Maximum URLs scraped at once by scrape_multiple_urls
+                (defaults to the page pool size)
+        """
+        self.pool = None  # Shared BrowserPool, attached on first initialize()
+        self.session = None
+        self._loop = None  # Event loop that pool and session belong to
+        self._process_pool = None  # Parsing workers, started on first use
+        
+        # Domains whose pages turned out to be JavaScript shells and need the browser
+        self._browser_domains = set()
+        
+        # LRU cache of successful results: (url, content_type) -> (timestamp, ScrapingResult)
+        self._cache = OrderedDict()
+        self._cache_ttl = 600  # 10 minutes
+        self._cache_max = 1024
+        self._cache_hits = 0
+        self._cache_misses = 0
         
         # Configuration
         self.timeout = 30000  # 30 seconds
         self.max_content_length = 50000  # 50KB
+        self.max_html_length = self.max_content_length * 4  # Raw HTML fed to the parser
+        self.direct_fetch_timeout = 10  # seconds
+        self.min_static_text_length = 200  # Visible characters for a page to count as static
+        self.pool_size = 8  # Maximum concurrent browser pages
+        self.idle_timeout = 300  # Close the browser after 5 idle minutes
+        self._max_concurrent = max_concurrent or self.pool_size
+        self.progress_log_interval = 10  # Log batch progress every N completed URLs
+        self.use_process_pool = True  # Parse HTML in worker processes instead of threads
+        self.viewport = {"width": 1920, "height": 1080}
+        
+        # Resource types that carry no extractable text
+        self.blocked_resource_types = {'image', 'media', 'font', 'stylesheet'}
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         
         # Scientific content patterns
@@ -82,10 +394,69 @@ class WebScraperService:
             'keywords': r'(?i)(keywords?|tags?)\s*:?\s*([^\.]+)',
             'funding': r'(?i)(funded|grant|sponsored)\s*:?\s*([^\.]+)',
         }
+        self._pattern_scanner, self._pattern_groups = self._compile_patterns(self.scientific_patterns)
+        
+        # Content selectors per content type, precompiled into a single
+        # comma-joined selector so each page is walked once
+        self._paper_selector = ', '.join([
+            'main', 'article', '.content', '.main-content', '.paper-content',
+            '.abstract', '.introduction', '.methodology', '.results', '.conclusion',
+            '#content', '#main', '.scientific-content', '.research-content'
+        ])
+        self._profile_selector = ', '.join([
+            '.profile', '.researcher-profile', '.author-profile',
+            '.bio', '.biography', '.about', '.research-interests',
+            '.publications', '.research-areas', '.expertise'
+        ])
+        self._institution_selector = ', '.join([
+            '.institution', '.university', '.department', '.faculty',
+            '.research', '.about', '.mission', '.vision',
+            '.academics', '.programs', '.faculty-profiles'
+        ])
+        self._selectors = {
+            'scientific_paper': self._paper_selector,
+            'research_profile': self._profile_selector,
+            'institution': self._institution_selector
+        }
+        
+        # Content extractors per content type; anything else uses _extract_general_content
+        self._extractors = {
+            'scientific_paper': self._extract_scientific_paper_content,
+            'research_profile': self._extract_research_profile_content,
+            'institution': self._extract_institution_content
+        }
         
         if logger:
             logger.info("WebScraper service initialized")
     
+    @property
+    def _initialized(self) -> bool:
+        """Whether the shared browser pool is up"""
+        return self.pool is not None and self.pool.is_running
+    
+    def _bind_loop(self):
+        """
+        Forget the pool and HTTP session if they were made on another event loop
+        
+        Each asyncio.run() call gets a new loop, and the previous loop's browser,
+        queue and session cannot be used (or closed) from it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self.pool = None
+            self.session = None
+    
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        # Keep the browser warm for the next batch; the pool's idle timeout shuts it down
+        if self.pool is not None:
+            self.pool.touch()
+        return False
+    
     async def initialize(self) -> bool:
         """Initialize Playwright browser"""
         if not PLAYWRIGHT_AVAILABLE:
@@ -93,43 +464,37 @@ class WebScraperService:
                 logger.error("Playwright not available")
             return False
         
-        # Clean up any existing browser
-        if self._initialized:
-            await self.close()
+        self._bind_loop()
+        if self.pool is None:
+            self.pool = get_browser_pool(
+                size=self.pool_size,
+                user_agent=self.user_agent,
+                viewport=self.viewport,
+                blocked_resource_types=self.blocked_resource_types,
+                idle_timeout=self.idle_timeout
+            )
+        
+        # Reuse the warm browser instead of relaunching
+        if self.pool.is_running:
+            return True
         
         try:
             if logger:
                 logger.info("Starting Playwright browser initialization...")
             
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-accelerated-2d-canvas',
-                    '--no-first-run',
-                    '--no-zygote',
-                    '--disable-gpu',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor'
-                ]
-            )
-            self.page = await self.browser.new_page()
-            # Set user agent and viewport
-            await self.page.set_extra_http_headers({"User-Agent": self.user_agent})
-            await self.page.set_viewport_size({"width": 1920, "height": 1080})
+            await self.pool.start()
             
-            # Test the page to ensure it's working
+            # Test a page to ensure it's working
+            page = await self.pool.acquire()
             try:
-                await self.page.goto("data:text/html,<html><body>Test</body></html>", timeout=5000)
+                await page.goto("data:text/html,<html><body>Test</body></html>", timeout=5000)
             except Exception as e:
                 if logger:
                     logger.error(f"Page test failed: {e}")
+                await self.pool.close()
                 return False
+            await self.pool.release(page)
             
-            self._initialized = True
             if logger:
                 logger.info("Playwright browser initialized successfully")
             return True
@@ -141,46 +506,118 @@ class WebScraperService:
     
     async def close(self):
         """Close browser and cleanup"""
+        self._bind_loop()
         try:
-            if self.page:
-                await self.page.close()
-                self.page = None
+            if self.session:
+                await self.session.close()
+                self.session = None
         except Exception as e:
             if logger:
-                logger.warning(f"Error closing page: {e}")
+                logger.warning(f"Error closing HTTP session: {e}")
         
-        try:
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-        except Exception as e:
-            if logger:
-                logger.warning(f"Error closing browser: {e}")
+        if self.pool is not None:
+            await self.pool.close()
+        
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+    
+    def _get_session(self):
+        """Get the shared aiohttp session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers={"User-Agent": self.user_agent},
+                timeout=aiohttp.ClientTimeout(total=self.direct_fetch_timeout),
+                # Keep sockets open so warmed-up connections get reused
+                connector=aiohttp.TCPConnector(keepalive_timeout=30)
+            )
+        return self.session
+    
+    async def _warm_connections(self, urls: List[str]):
+        """Resolve DNS and open keep-alive connections to each unique host"""
+        if not AIOHTTP_AVAILABLE:
+            return
+        
+        origins = {f"{parsed.scheme}://{parsed.netloc}/"
+                   for parsed in map(urlparse, urls)
+                   if parsed.scheme in ('http', 'https') and parsed.netloc}
+        session = self._get_session()
+        
+        async def head(origin: str):
+            try:
+                async with session.head(origin, timeout=aiohttp.ClientTimeout(total=3)):
+                    pass
+            except Exception:
+                pass
+        
+        await asyncio.gather(*(head(origin) for origin in origins))
+    
+    async def _fetch_direct(self, url: str) -> Optional[tuple]:
+        """
+        Fetch a page over plain HTTP without the browser
+        
+        Returns:
+            (html, title) tuple, or None if the page needs the browser
+        """
+        domain = urlparse(url).netloc
+        if not AIOHTTP_AVAILABLE or domain in self._browser_domains:
+            return None
         
         try:
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
+            async with self._get_session().get(url) as response:
+                if response.status != 200 or 'html' not in response.content_type:
+                    return None
+                html = await response.text(errors='replace')
         except Exception as e:
             if logger:
-                logger.warning(f"Error stopping playwright: {e}")
+                logger.debug(f"Direct fetch failed for {url}: {e}")
+            return None
         
-        self._initialized = False
+        if not self._looks_static(html):
+            # JavaScript-rendered page; remember so later URLs go straight to the browser
+            self._browser_domains.add(domain)
+            return None
+        
+        html = html[:self.max_html_length]
+        title_match = _TITLE_RE.search(html)
+        title = re.sub(r'\s+', ' ', title_match.group(1)).strip() if title_match else ''
+        return html, title
+    
+    def _looks_static(self, html: str) -> bool:
+        """Check whether fetched HTML already contains the page content"""
+        lowered = html.lower()
+        if '<main' in lowered or '<article' in lowered:
+            return True
+        
+        body_start = lowered.find('<body')
+        body = html[body_start:] if body_start != -1 else html
+        text = _TAG_RE.sub(' ', _SCRIPT_STYLE_RE.sub(' ', body))
+        return len(text.strip()) >= self.min_static_text_length
     
-    async def scrape_url(self, url: str, content_type: str = "scientific_paper") -> ScrapingResult:
+    async def scrape_url(self, url: str, content_type: str = "scientific_paper",
+                         keep_html: bool = False) -> ScrapingResult:
         """
         Scrape content from a URL
         
         Args:
             url: URL to scrape
             content_type: Type of content expected ('scientific_paper', 'research_profile', etc.)
+            keep_html: Keep the raw page HTML in the result (empty by default to save memory)
             
         Returns:
             ScrapingResult with scraped content or error
         """
         start_time = time.time()
+        self._bind_loop()
         
-        if not self._initialized:
+        cached = self._get_cached(url, content_type, keep_html)
+        if cached is not None:
+            return replace(cached, processing_time=time.time() - start_time)
+        
+        # Static pages don't need the browser at all
+        fetched = await self._fetch_direct(url)
+        
+        if fetched is None and not self._initialized:
             success = await self.initialize()
             if not success:
                 return ScrapingResult(
@@ -195,28 +632,39 @@ class WebScraperService:
             if logger:
                 logger.info(f"Scraping URL: {url}")
             
-            # Navigate to page
-            await self.page.goto(url, timeout=self.timeout, wait_until='networkidle')
-            
-            # Wait for content to load
-            await asyncio.sleep(2)
-            
-            # Get page content
-            html = await self.page.content()
-            title = await self.page.title()
-            
-            # Extract content based on type
-            if content_type == "scientific_paper":
-                content = await self._extract_scientific_paper_content(html)
-            elif content_type == "research_profile":
-                content = await self._extract_research_profile_content(html)
-            elif content_type == "institution":
-                content = await self._extract_institution_content(html)
+            extracted = None
+            if fetched is not None:
+                html, title = fetched
             else:
-                content = await self._extract_general_content(html)
+                page = await self.pool.acquire()
+                try:
+                    # Navigate to page
+                    await page.goto(url, timeout=self.timeout, wait_until='domcontentloaded')
+                    
+                    # Let the browser extract text from its own DOM unless the HTML is wanted
+                    if not keep_html:
+                        extracted = await self._extract_in_browser(page, content_type)
+                    
+                    if extracted is None:
+                        # Get page content, capped to bound parse time and memory
+                        html = await page.content()
+                        html = html[:self.max_html_length]
+                        title = await page.title()
+                finally:
+                    await self.pool.release(page)
             
-            # Extract metadata
-            metadata = self._extract_metadata(html, title, content)
+            if extracted is not None:
+                html = ''
+                title = extracted.get('title') or ''
+                content = extracted['content']
+                metadata = self._build_metadata(
+                    title, content,
+                    extracted.get('metaTags') or {},
+                    extracted.get('links') or []
+                )
+            else:
+                # Parsing is pure CPU work; keep it off the event loop
+                content, metadata = await self._run_extraction(html, title, content_type)
             
             # Create scraped content object
             scraped_content = ScrapedContent(
@@ -224,7 +672,7 @@ class WebScraperService:
                 title=title,
                 content=content,
                 metadata=metadata,
-                html=html,
+                html=html if keep_html else '',
                 timestamp=time.time(),
                 source_type=content_type
             )
@@ -234,13 +682,15 @@ class WebScraperService:
             if logger:
                 logger.info(f"Successfully scraped {url} in {processing_time:.2f}s")
             
-            return ScrapingResult(
+            result = ScrapingResult(
                 success=True,
                 content=scraped_content,
                 error=None,
                 processing_time=processing_time,
                 source_url=url
             )
+            self._set_cached(url, content_type, result)
+            return result
             
         except Exception as e:
             processing_time = time.time() - start_time
@@ -257,174 +707,290 @@ class WebScraperService:
                 source_url=url
             )
     
-    async def _extract_scientific_paper_content(self, html: str) -> str:
+    async def _run_extraction(self, html: str, title: str, content_type: str) -> tuple:
+        """Extract content and metadata in the process pool, falling back to a thread"""
+        if self.use_process_pool:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(
+                    self._process_pool, _parse_and_extract,
+                    html, title, content_type, self.max_content_length
+                )
+            except (BrokenProcessPool, OSError) as e:
+                if logger:
+                    logger.warning(f"Process pool unavailable, parsing in threads: {e}")
+                self._process_pool.shutdown(wait=False)
+                self._process_pool = None
+                self.use_process_pool = False
+        
+        return await asyncio.to_thread(self._extract_from_html, html, title, content_type)
+    
+    def _extract_from_html(self, html: str, title: str, content_type: str) -> tuple:
+        """Extract content and metadata from HTML based on content type"""
+        extractor = self._extractors.get(content_type, self._extract_general_content)
+        content = extractor(html)
+        metadata = self._extract_metadata(html, title, content)
+        return content, metadata
+    
+    async def _extract_in_browser(self, page, content_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract title, text, meta tags and links with page.evaluate
+        
+        Returns:
+            Extracted data, or None to fall back to parsing the HTML in Python
+        """
+        try:
+            data = await page.evaluate(_EXTRACT_JS, {
+                'selector': self._selectors.get(content_type),
+                'limit': self.max_content_length,
+                'metaNames': list(_META_WHITELIST)
+            })
+        except Exception as e:
+            if logger:
+                logger.debug(f"In-browser extraction failed: {e}")
+            return None
+        
+        if not data or not data.get('content'):
+            return None
+        return data
+    
+    def _get_cached(self, url: str, content_type: str, keep_html: bool = False) -> Optional[ScrapingResult]:
+        """Get a cached result if present and not expired"""
+        key = (url, content_type)
+        entry = self._cache.get(key)
+        if entry is None:
+            self._cache_misses += 1
+            return None
+        
+        timestamp, result = entry
+        if time.time() - timestamp > self._cache_ttl:
+            del self._cache[key]
+            self._cache_misses += 1
+            return None
+        
+        if keep_html and not result.content.html:
+            # Cached without HTML; scrape again to get it
+            self._cache_misses += 1
+            return None
+        
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return result
+    
+    def _set_cached(self, url: str, content_type: str, result: ScrapingResult):
+        """Cache a successful result, evicting the least recently used entry when full"""
+        key = (url, content_type)
+        self._cache[key] = (time.time(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+    
+    def invalidate(self, url: Optional[str] = None):
+        """
+        Drop cached results
+        
+        Args:
+            url: URL to drop for all content types, or None to clear the whole cache
+        """
+        if url is None:
+            self._cache.clear()
+            return
+        
+        for key in [key for key in self._cache if key[0] == url]:
+            del self._cache[key]
+    
+    def _extract_scientific_paper_content(self, html: str) -> str:
         """Extract content from scientific paper pages"""
         if not BEAUTIFULSOUP_AVAILABLE:
             return html
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Try to find main content areas
-        content_selectors = [
-            'main', 'article', '.content', '.main-content', '.paper-content',
-            '.abstract', '.introduction', '.methodology', '.results', '.conclusion',
-            '#content', '#main', '.scientific-content', '.research-content'
-        ]
+        soup = self._parse_html(html)
         
-        content = ""
-        for selector in content_selectors:
-            elements = soup.select(selector)
-            if elements:
-                content = " ".join([elem.get_text(strip=True) for elem in elements])
-                break
+        content = self._select_text(soup, self._paper_selector)
         
         # If no specific content found, get body text
         if not content:
-            content = soup.get_text(strip=True)
-        
-        # Clean up content
-        content = re.sub(r'\s+', ' ', content)
-        content = content[:self.max_content_length]
+            content = self._collect_text([soup])
         
         return content
     
-    async def _extract_research_profile_content(self, html: str) -> str:
+    def _extract_research_profile_content(self, html: str) -> str:
         """Extract content from research profile pages"""
         if not BEAUTIFULSOUP_AVAILABLE:
             return html
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Look for profile-specific content
-        profile_selectors = [
-            '.profile', '.researcher-profile', '.author-profile',
-            '.bio', '.biography', '.about', '.research-interests',
-            '.publications', '.research-areas', '.expertise'
-        ]
+        soup = self._parse_html(html)
         
-        content = ""
-        for selector in profile_selectors:
-            elements = soup.select(selector)
-            if elements:
-                content = " ".join([elem.get_text(strip=True) for elem in elements])
-                break
+        content = self._select_text(soup, self._profile_selector)
         
         # Fallback to general content
         if not content:
-            content = soup.get_text(strip=True)
-        
-        # Clean up content
-        content = re.sub(r'\s+', ' ', content)
-        content = content[:self.max_content_length]
+            content = self._collect_text([soup])
         
         return content
     
-    async def _extract_institution_content(self, html: str) -> str:
+    def _extract_institution_content(self, html: str) -> str:
         """Extract content from institution pages"""
         if not BEAUTIFULSOUP_AVAILABLE:
             return html
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Look for institution-specific content
-        institution_selectors = [
-            '.institution', '.university', '.department', '.faculty',
-            '.research', '.about', '.mission', '.vision',
-            '.academics', '.programs', '.faculty-profiles'
-        ]
+        soup = self._parse_html(html)
         
-        content = ""
-        for selector in institution_selectors:
-            elements = soup.select(selector)
-            if elements:
-                content = " ".join([elem.get_text(strip=True) for elem in elements])
-                break
+        content = self._select_text(soup, self._institution_selector)
         
         # Fallback to general content
         if not content:
-            content = soup.get_text(strip=True)
-        
-        # Clean up content
-        content = re.sub(r'\s+', ' ', content)
-        content = content[:self.max_content_length]
+            content = self._collect_text([soup])
         
         return content
     
-    async def _extract_general_content(self, html: str) -> str:
+    def _extract_general_content(self, html: str) -> str:
         """Extract general content from any page"""
         if not BEAUTIFULSOUP_AVAILABLE:
             return html
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+        soup = self._parse_html(html)
         
         # Get main content
-        content = soup.get_text(strip=True)
+        return self._collect_text([soup])
+    
+    def _parse_html(self, html: str):
+        """Parse HTML and strip tags and comments that carry no readable text"""
+        soup = BeautifulSoup(html, 'lxml' if LXML_AVAILABLE else 'html.parser')
         
-        # Clean up content
-        content = re.sub(r'\s+', ' ', content)
-        content = content[:self.max_content_length]
+        for element in soup(_BLOB_TAGS):
+            element.decompose()
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            comment.extract()
         
-        return content
+        return soup
+    
+    def _select_text(self, soup, selector: str) -> str:
+        """Collect text from all elements matching a combined selector"""
+        return self._collect_text(self._outermost(soup.select(selector)))
+    
+    @staticmethod
+    def _outermost(elements):
+        """
+        Skip elements nested inside an already yielded one so their text
+        is not counted twice (select() returns document order)
+        """
+        selected = set()
+        for elem in elements:
+            if any(id(parent) in selected for parent in elem.parents):
+                continue
+            selected.add(id(elem))
+            yield elem
+    
+    def _collect_text(self, elements) -> str:
+        """
+        Join whitespace-normalized element text in a single pass, stopping
+        once max_content_length characters have been collected
+        """
+        limit = self.max_content_length
+        texts = []
+        length = 0
+        for elem in elements:
+            text = _WS_RE.sub(' ', elem.get_text(' ', strip=True))
+            if not text:
+                continue
+            texts.append(text)
+            length += len(text) + 1
+            if length >= limit:
+                break
+        
+        return ' '.join(texts)[:limit]
+    
+    @staticmethod
+    def _compile_patterns(patterns: Dict[str, str]):
+        """
+        Compile named patterns into one alternation so content is scanned once
+        
+        Returns:
+            (compiled regex, {name: (first, end) indices of the pattern's own groups})
+        """
+        alternatives = []
+        for name, pattern in patterns.items():
+            # Inline global flags are only valid at the start of a whole expression
+            pattern = pattern.replace('(?i)', '')
+            alternatives.append(f'(?P<{name}>{pattern})')
+        scanner = re.compile('|'.join(alternatives), re.IGNORECASE)
+        
+        groups = {}
+        for name, pattern in patterns.items():
+            first = scanner.groupindex[name] + 1
+            groups[name] = (first, first + re.compile(pattern).groups)
+        
+        return scanner, groups
     
     def _extract_metadata(self, html: str, title: str, content: str) -> Dict[str, Any]:
         """Extract metadata from HTML and content"""
-        metadata = {
-            'title': title,
-            'content_length': len(content),
-            'extracted_patterns': {}
-        }
-        
-        # Extract patterns from content
-        for pattern_name, pattern in self.scientific_patterns.items():
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                metadata['extracted_patterns'][pattern_name] = matches
+        meta_tags = {}
+        links = None
         
-        # Extract meta tags
         if BEAUTIFULSOUP_AVAILABLE:
             soup = BeautifulSoup(html, 'html.parser')
             
-            # Meta tags
-            meta_tags = soup.find_all('meta')
-            for meta in meta_tags:
+            # Meta tags, first occurrence of each whitelisted name only
+            for meta in soup.select('meta[name], meta[property]'):
                 name = meta.get('name', meta.get('property', ''))
+                if name not in _META_WHITELIST or name in meta_tags:
+                    continue
                 content_val = meta.get('content', '')
-                if name and content_val:
-                    metadata[f'meta_{name}'] = content_val
+                if content_val:
+                    meta_tags[name] = content_val
             
             # Links
-            links = soup.find_all('a', href=True)
-            metadata['links'] = [link['href'] for link in links[:10]]  # First 10 links
+            links = [link['href'] for link in soup.find_all('a', href=True, limit=10)]  # First 10 links
+        
+        return self._build_metadata(title, content, meta_tags, links)
+    
+    def _build_metadata(self, title: str, content: str, meta_tags: Dict[str, str],
+                        links: Optional[List[str]]) -> Dict[str, Any]:
+        """Assemble metadata from extracted content, meta tags and links"""
+        metadata = {
+            'title': title,
+            'content_length': len(content),
+            'extracted_patterns': {}
+        }
+        
+        # Extract patterns from content in a single scan
+        extracted = metadata['extracted_patterns']
+        for match in self._pattern_scanner.finditer(content):
+            name = match.lastgroup
+            first, last = self._pattern_groups[name]
+            if last - first > 1:
+                value = match.group(*range(first, last))
+            elif last - first == 1:
+                value = match.group(first)
+            else:
+                value = match.group(name)
+            extracted.setdefault(name, []).append(value)
+        
+        for name, value in meta_tags.items():
+            metadata[f'meta_{name}'] = value
+        
+        if links is not None:
+            metadata['links'] = links
         
         return metadata
     
-    async def scrape_multiple_urls(self, urls: List[str], content_types: Optional[List[str]] = None) -> List[ScrapingResult]:
+    async def scrape_multiple_urls(self, urls: List[str], content_types: Optional[List[str]] = None,
+                                   keep_html: bool = False) -> List[ScrapingResult]:
         """
         Scrape multiple URLs concurrently
         
         Args:
             urls: List of URLs to scrape
             content_types: List of content types (optional)
+            keep_html: Keep the raw page HTML in each result
             
         Returns:
             List of ScrapingResult objects
         """
+        self._bind_loop()
         if content_types is None:
             content_types = ["scientific_paper"] * len(urls)
         
@@ -432,10 +998,31 @@ class WebScraperService:
         if len(content_types) != len(urls):
             content_types = content_types + ["scientific_paper"] * (len(urls) - len(content_types))
         
+        # Warm DNS and TCP connections while the browser starts (if any host needs it)
+        warmup = asyncio.ensure_future(self._warm_connections(urls))
+        if not self._initialized and any(urlparse(url).netloc in self._browser_domains for url in urls):
+            await self.initialize()
+        await warmup
+        
+        # Bound concurrency so large batches don't pile up on the browser
+        semaphore = asyncio.Semaphore(min(self._max_concurrent, len(urls)) or 1)
+        completed = 0
+        
+        async def bounded_scrape(url: str, content_type: str) -> ScrapingResult:
+            nonlocal completed
+            async with semaphore:
+                try:
+                    return await self.scrape_url(url, content_type, keep_html)
+                finally:
+                    completed += 1
+                    if logger and completed % self.progress_log_interval == 0:
+                        logger.info(f"Scraped {completed}/{len(urls)} URLs, "
+                                    f"{len(urls) - completed} still queued or running")
+        
         # Create tasks for concurrent scraping
         tasks = []
         for url, content_type in zip(urls, content_types):
-            task = self.scrape_url(url, content_type)
+            task = bounded_scrape(url, content_type)
             tasks.append(task)
         
         # Execute all tasks concurrently
@@ -467,8 +1054,17 @@ class WebScraperService:
             'available': self.is_available(),
             'playwright_available': PLAYWRIGHT_AVAILABLE,
             'beautifulsoup_available': BEAUTIFULSOUP_AVAILABLE,
+            'lxml_available': LXML_AVAILABLE,
+            'aiohttp_available': AIOHTTP_AVAILABLE,
             'initialized': self._initialized,
-            'browser_running': self.browser is not None
+            'browser_running': self._initialized,
+            'cache': {
+                'size': len(self._cache),
+                'max_size': self._cache_max,
+                'ttl': self._cache_ttl,
+                'hits': self._cache_hits,
+                'misses': self._cache_misses
+            }
         }
 
 # Global instance
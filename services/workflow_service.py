@@ -8,8 +8,16 @@ This module provides a lean, 3-phase data workflow system:
 """
 
 from typing import Dict, Any, List, Optional
+import heapq
 import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
+from urllib.parse import urlparse
 
 try:
     from models.database import db
@@ -36,16 +44,105 @@ try:
 except ImportError:
     get_strategic_db = None
 
+try:
+    from services.llm_cache import LLMCache
+except ImportError:
+    LLMCache = None
+
+try:
+    from config import OLLAMA_CONCURRENCY
+except ImportError:
+    OLLAMA_CONCURRENCY = 8
+
 try:
     from utils.logger import get_logger
     logger = get_logger('workflow_service')
 except ImportError:
     logger = None
 
+# Cached front for ollama_service.generate_text shared by all workflow phases
+if ollama_service and LLMCache:
+    cached_generate_text = LLMCache(ollama_service.generate_text, ollama_service.get_selected_model)
+elif ollama_service:
+    cached_generate_text = ollama_service.generate_text
+else:
+    cached_generate_text = None
+
+# Score and recommendation scanning for free-text lead analyses
+_SCORE_RE = re.compile(r'score[^0-9]*([0-9]+)', re.IGNORECASE)
+_RECOMMENDATION_KEYWORDS = ('recommend', 'suggest', 'next step', 'action')
+
+# Prompt templates; analysis tasks follow the shared data context (see _build_analysis_prompt)
+ANALYSIS_CONTEXT_PREAMBLE = "You are analyzing the following collected data:"
+
+SUMMARY_PROMPT = "Summarize this content in 2-3 sentences: {content}"
+
+AI_RESEARCH_PROMPT = """Conduct comprehensive research on: {topic}
+
+Please provide:
+1. Key companies and organizations
+2. Important people and contacts
+3. Market trends and insights
+4. Opportunities and challenges
+5. Recommended next steps
+
+Research depth: {depth}
+"""
+
+LEAD_ANALYSIS_PROMPT = """Analyze this lead and provide a score (1-10) and insights:
+
+Title: {title}
+Description: {description}
+
+Please provide:
+1. Relevance score (1-10)
+2. Opportunity assessment
+3. Contact strategy
+4. Next steps
+"""
+
+LEAD_BATCH_PROMPT = """Score each of the following leads for relevance (1-10) and suggest next steps.
+Return only a JSON array with one object per lead, in this form:
+[{{"id": <lead number>, "score": <1-10>, "assessment": "<opportunity assessment>", "recommendations": ["<next step>", "..."]}}]
+
+{leads}
+"""
+
+RAG_ANALYSIS_TASK = """Analyze the data above and provide insights:
+
+Please provide:
+1. Key themes and patterns
+2. Important opportunities
+3. Notable contacts and companies
+4. Market trends
+5. Recommended actions
+"""
+
+MARKET_RESEARCH_TASK = """Perform market research analysis on the data above:
+
+Please provide:
+1. Market trends and patterns
+2. Competitive landscape
+3. Market opportunities
+4. Risk factors
+5. Strategic recommendations
+"""
+
+STRATEGIC_PLANNING_TASK = """Generate strategic planning insights from the data above:
+
+Please provide:
+1. Strategic objectives
+2. Key initiatives
+3. Resource requirements
+4. Timeline recommendations
+5. Success metrics
+"""
+
 class DataInService:
     """Phase 1: Data collection and ingestion"""
     
     def __init__(self):
+        self.upload_batch_size = 64  # Uploaded leads per bulk insert
         self.sources = {
             'web_search': serp_service,
             'research_apis': research_service,
@@ -59,26 +156,32 @@ class DataInService:
                 engines = ['google', 'bing', 'duckduckgo']
             
             results = []
-            for engine in engines:
-                if serp_service:
-                    engine_results = serp_service.search(query, engine=engine)
-                    results.extend(engine_results.get('results', []))
+            if serp_service:
+                # Query all engines concurrently; map() keeps results in engine order
+                with ThreadPoolExecutor(max_workers=len(engines)) as executor:
+                    for engine_results in executor.map(self._search_engine, [query] * len(engines), engines):
+                        results.extend(engine_results)
+            
+            # The same page is often returned by several engines
+            raw_count = len(results)
+            results = self._dedupe_results(results)
             
             # Save to database
             if db:
-                for result in results:
-                    db.save_lead({
-                        'title': result.get('title', ''),
-                        'description': result.get('snippet', ''),
-                        'link': result.get('link', ''),
-                        'source': 'web_search',
-                        'ai_summary': self._generate_ai_summary(result)
-                    })
+                summaries = self._generate_ai_summaries(results)
+                db.save_leads_bulk([{
+                    'title': result.get('title', ''),
+                    'description': result.get('snippet', ''),
+                    'link': result.get('link', ''),
+                    'source': 'web_search',
+                    'ai_summary': summary
+                } for result, summary in zip(results, summaries)])
             
             return {
                 'success': True,
                 'results': results,
                 'count': len(results),
+                'raw_count': raw_count,
                 'query': query,
                 'engines': engines
             }
@@ -98,14 +201,15 @@ class DataInService:
             
             # Save to database
             if db and results.get('success'):
-                for result in results.get('results', []):
-                    db.save_lead({
-                        'title': result.get('title', ''),
-                        'description': result.get('description', ''),
-                        'link': result.get('link', ''),
-                        'source': f'research_{research_type}',
-                        'ai_summary': self._generate_ai_summary(result)
-                    })
+                research_results = results.get('results', [])
+                summaries = self._generate_ai_summaries(research_results)
+                db.save_leads_bulk([{
+                    'title': result.get('title', ''),
+                    'description': result.get('description', ''),
+                    'link': result.get('link', ''),
+                    'source': f'research_{research_type}',
+                    'ai_summary': summary
+                } for result, summary in zip(research_results, summaries)])
             
             return results
             
@@ -118,34 +222,38 @@ class DataInService:
         """Upload and process documents"""
         try:
             processed_files = []
-            
-            for file_info in files:
-                # Process different file types
-                if file_info.get('type') == 'pdf':
-                    content = self._extract_pdf_content(file_info)
-                elif file_info.get('type') == 'text':
-                    content = file_info.get('content', '')
-                elif file_info.get('type') == 'csv':
-                    content = self._parse_csv_content(file_info)
-                else:
-                    content = file_info.get('content', '')
-                
-                # Save to database
-                if db:
-                    db.save_lead({
+            if not files:
+                return {'success': True, 'files': processed_files, 'count': 0}
+            
+            # Parsing runs ahead of summarizing so CPU work overlaps the model calls;
+            # map() keeps file order and leads are saved in bulk batches as they complete
+            pending = []
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, len(files))) as parse_pool, \
+                    ThreadPoolExecutor(max_workers=min(OLLAMA_CONCURRENCY, len(files))) as summary_pool:
+                for file_info, content in zip(files, parse_pool.map(self._parse_document, files)):
+                    lead = {
                         'title': file_info.get('name', 'Uploaded Document'),
                         'description': content[:500] + '...' if len(content) > 500 else content,
                         'link': '',
-                        'source': 'document_upload',
-                        'ai_summary': self._generate_ai_summary({'content': content})
+                        'source': 'document_upload'
+                    }
+                    summary = None
+                    if db and ollama_service:
+                        summary = summary_pool.submit(self._generate_ai_summary, {'content': content})
+                    pending.append((lead, summary))
+                    
+                    processed_files.append({
+                        'name': file_info.get('name'),
+                        'type': file_info.get('type'),
+                        'size': len(content),
+                        'processed': True
                     })
+                    
+                    if len(pending) >= self.upload_batch_size:
+                        self._save_uploaded_leads(pending)
+                        pending = []
                 
-                processed_files.append({
-                    'name': file_info.get('name'),
-                    'type': file_info.get('type'),
-                    'size': len(content),
-                    'processed': True
-                })
+                self._save_uploaded_leads(pending)
             
             return {
                 'success': True,
@@ -158,6 +266,28 @@ class DataInService:
                 logger.error(f"Document upload error: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _parse_document(self, file_info: Dict[str, Any]) -> str:
+        """Extract text content from an uploaded file"""
+        # Process different file types
+        if file_info.get('type') == 'pdf':
+            return self._extract_pdf_content(file_info)
+        elif file_info.get('type') == 'text':
+            return file_info.get('content', '')
+        elif file_info.get('type') == 'csv':
+            return self._parse_csv_content(file_info)
+        return file_info.get('content', '')
+    
+    def _save_uploaded_leads(self, pending: List[tuple]):
+        """Save (lead, summary future) pairs once their summaries are ready"""
+        if not db or not pending:
+            return
+        
+        leads = []
+        for lead, summary in pending:
+            lead['ai_summary'] = summary.result() if summary else ''
+            leads.append(lead)
+        db.save_leads_bulk(leads)
+    
     def ai_research(self, topic: str, depth: str = 'medium') -> Dict[str, Any]:
         """AI-powered research using AutoGPT"""
         try:
@@ -165,35 +295,23 @@ class DataInService:
                 return {'success': False, 'error': 'AI service not available'}
             
             # Generate research prompt
-            prompt = f"""
-            Conduct comprehensive research on: {topic}
-            
-            Please provide:
-            1. Key companies and organizations
-            2. Important people and contacts
-            3. Market trends and insights
-            4. Opportunities and challenges
-            5. Recommended next steps
-            
-            Research depth: {depth}
-            """
+            prompt = AI_RESEARCH_PROMPT.format(topic=topic, depth=depth)
             
             # Get AI research results
-            research_results = ollama_service.generate_text(prompt)
+            research_results = cached_generate_text(prompt)
             
             # Parse and structure results
             structured_results = self._parse_ai_research(research_results)
             
             # Save to database
             if db:
-                for result in structured_results:
-                    db.save_lead({
-                        'title': result.get('title', ''),
-                        'description': result.get('description', ''),
-                        'link': result.get('link', ''),
-                        'source': 'ai_research',
-                        'ai_summary': result.get('summary', '')
-                    })
+                db.save_leads_bulk([{
+                    'title': result.get('title', ''),
+                    'description': result.get('description', ''),
+                    'link': result.get('link', ''),
+                    'source': 'ai_research',
+                    'ai_summary': result.get('summary', '')
+                } for result in structured_results])
             
             return {
                 'success': True,
@@ -208,6 +326,43 @@ class DataInService:
                 logger.error(f"AI research error: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _dedupe_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop results whose link (or title, if no link) was already seen, keeping order"""
+        seen = set()
+        deduped = []
+        for result in results:
+            link = result.get('link', '')
+            if link:
+                parsed = urlparse(link)
+                key = f"{parsed.netloc.lower()}{parsed.path.rstrip('/')}?{parsed.query}"
+            else:
+                key = result.get('title', '').strip().lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            deduped.append(result)
+        return deduped
+    
+    def _search_engine(self, query: str, engine: str) -> List[Dict[str, Any]]:
+        """Search a single engine, returning no results on failure"""
+        try:
+            return serp_service.search(query, engines=[engine])
+        except Exception as e:
+            if logger:
+                logger.error(f"{engine} search error: {e}")
+            return []
+    
+    def _generate_ai_summaries(self, results: List[Dict[str, Any]]) -> List[str]:
+        """Generate AI summaries for several results concurrently, in input order"""
+        if not results:
+            return []
+        if not ollama_service:
+            return [''] * len(results)
+        
+        # Bounded so the local model server isn't flooded
+        with ThreadPoolExecutor(max_workers=min(OLLAMA_CONCURRENCY, len(results))) as executor:
+            return list(executor.map(self._generate_ai_summary, results))
+    
     def _generate_ai_summary(self, result: Dict[str, Any]) -> str:
         """Generate AI summary for a result"""
         try:
@@ -215,9 +370,9 @@ class DataInService:
                 return ''
             
             content = f"{result.get('title', '')} {result.get('description', '')} {result.get('content', '')}"
-            prompt = f"Summarize this content in 2-3 sentences: {content[:1000]}"
+            prompt = SUMMARY_PROMPT.format(content=content[:1000])
             
-            return ollama_service.generate_text(prompt)
+            return cached_generate_text(prompt)
             
         except Exception as e:
             if logger:
@@ -244,10 +399,33 @@ class DataInService:
             'summary': research_text
         }]
 
+@dataclass
+class DataBatch:
+    """Column view of lead rows, built in one pass and shared by the analyses"""
+    ids: List[int] = field(default_factory=list)
+    titles: List[str] = field(default_factory=list)
+    descriptions: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_items(cls, data_items: List[Dict[str, Any]]) -> 'DataBatch':
+        """Split lead dicts into columns"""
+        batch = cls()
+        for item in data_items:
+            batch.ids.append(item.get('id'))
+            batch.titles.append(item.get('title', ''))
+            batch.descriptions.append(item.get('description', ''))
+            batch.sources.append(item.get('source', ''))
+        return batch
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+
 class DataProcessService:
     """Phase 2: Data analysis and processing"""
     
     def __init__(self):
+        self.lead_batch_size = 10  # Leads scored per Ollama call
         self.analysis_types = {
             'rag_analysis': self._rag_analysis,
             'lead_analysis': self._lead_analysis,
@@ -265,15 +443,15 @@ class DataProcessService:
             if not db:
                 return {'success': False, 'error': 'Database not available'}
             
-            data_items = []
-            for data_id in data_ids:
-                item = db.get_lead_by_id(data_id)
-                if item:
-                    data_items.append(item)
+            data_items = db.get_leads_by_ids(data_ids)
             
-            # Perform analysis
+            # Perform analysis; the column view and joined context are built once and shared
             analysis_function = self.analysis_types[analysis_type]
-            results = analysis_function(data_items)
+            if analysis_type == 'lead_analysis':
+                results = analysis_function(data_items)
+            else:
+                batch = DataBatch.from_items(data_items)
+                results = analysis_function(data_items, context=self._build_context(batch), batch=batch)
             
             return {
                 'success': True,
@@ -287,34 +465,39 @@ class DataProcessService:
                 logger.error(f"Data analysis error: {e}")
             return {'success': False, 'error': str(e)}
     
-    def _rag_analysis(self, data_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _build_context(self, batch: DataBatch) -> str:
+        """Combine data items into the context shared by the analysis prompts"""
+        return "\n\n".join(
+            f"{title}: {description}"
+            for title, description in zip(batch.titles, batch.descriptions)
+        )
+    
+    def _build_analysis_prompt(self, context: str, task: str) -> str:
+        """
+        Build an analysis prompt with the data context first and the task last
+        
+        The context prefix is identical across analysis types, so Ollama can
+        reuse its prompt cache when several analyses run over the same data.
+        """
+        return f"{ANALYSIS_CONTEXT_PREAMBLE}\n{context}\n\n---\nTASK:\n{task}"
+    
+    def _rag_analysis(self, data_items: List[Dict[str, Any]], context: Optional[str] = None,
+                      batch: Optional[DataBatch] = None) -> Dict[str, Any]:
         """RAG analysis of collected data"""
         try:
-            # Combine all data for context
-            context = "\n\n".join([
-                f"{item.get('title', '')}: {item.get('description', '')}"
-                for item in data_items
-            ])
+            if batch is None:
+                batch = DataBatch.from_items(data_items)
+            if context is None:
+                context = self._build_context(batch)
             
             # Generate insights
-            prompt = f"""
-            Analyze this data and provide insights:
-            
-            {context}
-            
-            Please provide:
-            1. Key themes and patterns
-            2. Important opportunities
-            3. Notable contacts and companies
-            4. Market trends
-            5. Recommended actions
-            """
+            prompt = self._build_analysis_prompt(context, RAG_ANALYSIS_TASK)
             
             if ollama_service:
-                insights = ollama_service.generate_text(prompt)
+                insights = cached_generate_text(prompt)
             else:
                 # Fallback analysis without AI
-                insights = self._fallback_analysis(data_items, "RAG")
+                insights = self._fallback_analysis(batch, "RAG")
             
             return {
                 'insights': insights,
@@ -332,35 +515,27 @@ class DataProcessService:
         try:
             scored_leads = []
             
-            for item in data_items:
-                # Score each lead
-                prompt = f"""
-                Analyze this lead and provide a score (1-10) and insights:
-                
-                Title: {item.get('title', '')}
-                Description: {item.get('description', '')}
-                
-                Please provide:
-                1. Relevance score (1-10)
-                2. Opportunity assessment
-                3. Contact strategy
-                4. Next steps
-                """
+            # Score leads several at a time; anything the batch reply misses is scored on its own
+            for start in range(0, len(data_items), self.lead_batch_size):
+                batch = data_items[start:start + self.lead_batch_size]
+                batch_scores = self._score_lead_batch(batch) if ollama_service else {}
                 
-                if ollama_service:
-                    analysis = ollama_service.generate_text(prompt)
-                else:
-                    # Fallback analysis without AI
-                    analysis = self._fallback_lead_analysis(item)
-                
-                scored_leads.append({
-                    'id': item.get('id'),
-                    'title': item.get('title', ''),
-                    'description': item.get('description', ''),
-                    'analysis': analysis,
-                    'score': self._extract_score(analysis),
-                    'recommendations': self._extract_recommendations(analysis)
-                })
+                for number, item in enumerate(batch, 1):
+                    if number in batch_scores:
+                        analysis, score, recommendations = batch_scores[number]
+                    else:
+                        analysis = self._analyze_single_lead(item)
+                        score = self._extract_score(analysis)
+                        recommendations = self._extract_recommendations(analysis)
+                    
+                    scored_leads.append({
+                        'id': item.get('id'),
+                        'title': item.get('title', ''),
+                        'description': item.get('description', ''),
+                        'analysis': analysis,
+                        'score': score,
+                        'recommendations': recommendations
+                    })
             
             return {
                 'leads': scored_leads,
@@ -373,33 +548,72 @@ class DataProcessService:
                 logger.error(f"Lead analysis error: {e}")
             return {'error': str(e)}
     
-    def _market_research(self, data_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_single_lead(self, item: Dict[str, Any]) -> str:
+        """Analyze one lead with its own prompt"""
+        if ollama_service:
+            return cached_generate_text(LEAD_ANALYSIS_PROMPT.format(
+                title=item.get('title', ''),
+                description=item.get('description', '')
+            ))
+        
+        # Fallback analysis without AI
+        return self._fallback_lead_analysis(item)
+    
+    def _score_lead_batch(self, batch: List[Dict[str, Any]]) -> Dict[int, tuple]:
+        """
+        Score several leads with a single prompt
+        
+        Returns:
+            {lead number (1-based position in batch): (analysis, score, recommendations)};
+            empty if the reply could not be parsed
+        """
+        if len(batch) < 2:
+            return {}
+        
+        leads_text = "\n\n".join(
+            f"Lead {number}:\nTitle: {item.get('title', '')}\nDescription: {item.get('description', '')}"
+            for number, item in enumerate(batch, 1)
+        )
+        response = cached_generate_text(LEAD_BATCH_PROMPT.format(leads=leads_text))
+        try:
+            entries = json.loads(response[response.index('['):response.rindex(']') + 1])
+        except (ValueError, TypeError):
+            if logger:
+                logger.warning("Batch lead scoring returned invalid JSON, scoring leads individually")
+            return {}
+        
+        scores = {}
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                number = int(entry['id'])
+                score = min(max(int(entry.get('score', 5)), 1), 10)
+                # Anything but a list (a number, or a string that would split into characters) is dropped
+                recommendations = entry.get('recommendations')
+                recommendations = [str(rec) for rec in recommendations][:3] if isinstance(recommendations, list) else []
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 1 <= number <= len(batch):
+                continue
+            scores[number] = (str(entry.get('assessment', '')), score, recommendations)
+        
+        return scores
+    
+    def _market_research(self, data_items: List[Dict[str, Any]], context: Optional[str] = None,
+                         batch: Optional[DataBatch] = None) -> Dict[str, Any]:
         """Market research analysis"""
         try:
-            # Combine data for market analysis
-            market_data = "\n\n".join([
-                f"{item.get('title', '')}: {item.get('description', '')}"
-                for item in data_items
-            ])
-            
-            prompt = f"""
-            Perform market research analysis on this data:
-            
-            {market_data}
-            
-            Please provide:
-            1. Market trends and patterns
-            2. Competitive landscape
-            3. Market opportunities
-            4. Risk factors
-            5. Strategic recommendations
-            """
+            if batch is None:
+                batch = DataBatch.from_items(data_items)
+            if context is None:
+                context = self._build_context(batch)
+            
+            prompt = self._build_analysis_prompt(context, MARKET_RESEARCH_TASK)
             
             if ollama_service:
-                market_analysis = ollama_service.generate_text(prompt)
+                market_analysis = cached_generate_text(prompt)
             else:
                 # Fallback analysis without AI
-                market_analysis = self._fallback_analysis(data_items, "Market Research")
+                market_analysis = self._fallback_analysis(batch, "Market Research")
             
             return {
                 'market_analysis': market_analysis,
@@ -412,33 +626,22 @@ class DataProcessService:
                 logger.error(f"Market research error: {e}")
             return {'error': str(e)}
     
-    def _strategic_planning(self, data_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _strategic_planning(self, data_items: List[Dict[str, Any]], context: Optional[str] = None,
+                            batch: Optional[DataBatch] = None) -> Dict[str, Any]:
         """Strategic planning analysis"""
         try:
-            # Combine data for strategic analysis
-            strategic_data = "\n\n".join([
-                f"{item.get('title', '')}: {item.get('description', '')}"
-                for item in data_items
-            ])
-            
-            prompt = f"""
-            Generate strategic planning insights from this data:
-            
-            {strategic_data}
-            
-            Please provide:
-            1. Strategic objectives
-            2. Key initiatives
-            3. Resource requirements
-            4. Timeline recommendations
-            5. Success metrics
-            """
+            if batch is None:
+                batch = DataBatch.from_items(data_items)
+            if context is None:
+                context = self._build_context(batch)
+            
+            prompt = self._build_analysis_prompt(context, STRATEGIC_PLANNING_TASK)
             
             if ollama_service:
-                strategic_plan = ollama_service.generate_text(prompt)
+                strategic_plan = cached_generate_text(prompt)
             else:
                 # Fallback analysis without AI
-                strategic_plan = self._fallback_analysis(data_items, "Strategic Planning")
+                strategic_plan = self._fallback_analysis(batch, "Strategic Planning")
             
             return {
                 'strategic_plan': strategic_plan,
@@ -451,29 +654,30 @@ class DataProcessService:
                 logger.error(f"Strategic planning error: {e}")
             return {'error': str(e)}
     
-    def _fallback_analysis(self, data_items: List[Dict[str, Any]], analysis_type: str) -> str:
+    def _fallback_analysis(self, batch: DataBatch, analysis_type: str) -> str:
         """Fallback analysis when AI service is not available"""
         try:
             # Simple text-based analysis
-            titles = [item.get('title', '') for item in data_items]
-            descriptions = [item.get('description', '') for item in data_items]
-            sources = [item.get('source', '') for item in data_items]
+            unique_titles = set(batch.titles)
+            unique_sources = set(batch.sources)
+            item_count = len(batch)
+            sources_str = ', '.join(unique_sources)
             
             analysis = f"""
             {analysis_type} Results:
             
             Data Summary:
-            - Total items analyzed: {len(data_items)}
-            - Sources: {', '.join(set(sources))}
+            - Total items analyzed: {item_count}
+            - Sources: {sources_str}
             
             Key Findings:
-            - Analyzed {len(titles)} data items
-            - Found {len(set(titles))} unique titles
-            - Data from {len(set(sources))} different sources
+            - Analyzed {item_count} data items
+            - Found {len(unique_titles)} unique titles
+            - Data from {len(unique_sources)} different sources
             
             Recommendations:
-            1. Review all {len(data_items)} items for relevance
-            2. Focus on items from {', '.join(set(sources))} sources
+            1. Review all {item_count} items for relevance
+            2. Focus on items from {sources_str} sources
             3. Consider manual review of top items
             4. Export results for further analysis
             
@@ -530,16 +734,8 @@ class DataProcessService:
     def _extract_score(self, analysis: str) -> int:
         """Extract numerical score from analysis text"""
         try:
-            # Simple extraction - would use more sophisticated parsing
-            if 'score' in analysis.lower():
-                for line in analysis.split('\n'):
-                    if 'score' in line.lower():
-                        # Extract number from line
-                        import re
-                        numbers = re.findall(r'\d+', line)
-                        if numbers:
-                            return min(int(numbers[0]), 10)
-            return 5  # Default score
+            match = _SCORE_RE.search(analysis)
+            return min(int(match.group(1)), 10) if match else 5  # Default score
         except:
             return 5
     
@@ -547,11 +743,13 @@ class DataProcessService:
         """Extract recommendations from analysis text"""
         try:
             recommendations = []
-            lines = analysis.split('\n')
-            for line in lines:
-                if any(keyword in line.lower() for keyword in ['recommend', 'suggest', 'next step', 'action']):
+            for line in analysis.splitlines():
+                lowered = line.lower()
+                if any(keyword in lowered for keyword in _RECOMMENDATION_KEYWORDS):
                     recommendations.append(line.strip())
-            return recommendations[:3]  # Top 3 recommendations
+                    if len(recommendations) == 3:  # Top 3 recommendations
+                        break
+            return recommendations
         except:
             return []
 
@@ -592,15 +790,26 @@ class DataOutService:
         try:
             leads = processed_data.get('leads', [])
             
+            # Bucket scores in one pass
+            high_priority = medium_priority = low_priority = 0
+            for lead in leads:
+                score = lead.get('score', 0)
+                if score >= 8:
+                    high_priority += 1
+                elif score >= 5:
+                    medium_priority += 1
+                else:
+                    low_priority += 1
+            
             report = {
                 'title': 'Lead Analysis Report',
                 'summary': f'Analysis of {len(leads)} leads',
                 'top_leads': leads[:10],
                 'statistics': {
                     'total_leads': len(leads),
-                    'high_priority': len([l for l in leads if l.get('score', 0) >= 8]),
-                    'medium_priority': len([l for l in leads if 5 <= l.get('score', 0) < 8]),
-                    'low_priority': len([l for l in leads if l.get('score', 0) < 5])
+                    'high_priority': high_priority,
+                    'medium_priority': medium_priority,
+                    'low_priority': low_priority
                 },
                 'recommendations': self._extract_top_recommendations(leads)
             }
@@ -668,21 +877,19 @@ class DataOutService:
             # Extract action items from various analysis types
             if 'leads' in processed_data:
                 for lead in processed_data['leads'][:5]:  # Top 5 leads
-                    recommendations = lead.get('recommendations', [])
-                    for rec in recommendations:
+                    priority = lead.get('score', 5)
+                    title = lead.get('title', '')
+                    for rec in lead.get('recommendations', []):
                         action_items.append({
                             'type': 'lead_followup',
-                            'priority': lead.get('score', 5),
+                            'priority': priority,
                             'action': rec,
-                            'lead': lead.get('title', '')
+                            'lead': title
                         })
             
-            # Sort by priority
-            action_items.sort(key=lambda x: x.get('priority', 0), reverse=True)
-            
             return {
                 'title': 'Action Items',
-                'items': action_items[:10],  # Top 10 action items
+                'items': heapq.nlargest(10, action_items, key=lambda x: x.get('priority', 0)),  # Top 10 action items
                 'total_items': len(action_items)
             }
             
@@ -694,13 +901,16 @@ class DataOutService:
     def _extract_top_recommendations(self, leads: List[Dict[str, Any]]) -> List[str]:
         """Extract top recommendations from leads"""
         try:
-            all_recommendations = []
+            # First 5 unique recommendations, in lead order
+            unique_recommendations = {}
             for lead in leads:
-                recommendations = lead.get('recommendations', [])
-                all_recommendations.extend(recommendations)
+                for rec in lead.get('recommendations', ()):
+                    if rec not in unique_recommendations:
+                        unique_recommendations[rec] = None
+                        if len(unique_recommendations) == 5:
+                            return list(unique_recommendations)
             
-            # Return unique recommendations
-            return list(set(all_recommendations))[:5]
+            return list(unique_recommendations)
         except:
             return []
 
@@ -708,17 +918,41 @@ class DataWorkflow:
     """Unified data workflow manager"""
     
     def __init__(self):
-        self.data_in = DataInService()
-        self.data_process = DataProcessService()
-        self.data_out = DataOutService()
+        # Guards progress, which collect_data_multi's workers and pollers share
+        self._progress_lock = threading.Lock()
         self.progress = {
             'data_in': {'status': 'pending', 'progress': 0},
             'data_process': {'status': 'pending', 'progress': 0},
             'data_out': {'status': 'pending', 'progress': 0}
         }
     
+    def _set_progress(self, phase: str, status: str, progress: int):
+        """Replace one phase's progress entry"""
+        with self._progress_lock:
+            self.progress[phase] = {'status': status, 'progress': progress}
+    
+    # Phase services are built on first use, so callers needing one phase skip the others
+    @cached_property
+    def data_in(self) -> DataInService:
+        return DataInService()
+    
+    @cached_property
+    def data_process(self) -> DataProcessService:
+        return DataProcessService()
+    
+    @cached_property
+    def data_out(self) -> DataOutService:
+        return DataOutService()
+    
     def collect_data(self, source: str, query: str, **kwargs) -> Dict[str, Any]:
         """Phase 1: Collect data from various sources"""
+        result = self._collect_from_source(source, query, **kwargs)
+        if result.get('success'):
+            self._set_progress('data_in', 'completed', 100)
+        return result
+    
+    def _collect_from_source(self, source: str, query: str, **kwargs) -> Dict[str, Any]:
+        """Collect data from one source without touching progress"""
         try:
             if source == 'web_search':
                 result = self.data_in.quick_search(query, **kwargs)
@@ -731,9 +965,6 @@ class DataWorkflow:
             else:
                 return {'success': False, 'error': f'Unknown source: {source}'}
             
-            if result.get('success'):
-                self.progress['data_in'] = {'status': 'completed', 'progress': 100}
-            
             return result
             
         except Exception as e:
@@ -741,13 +972,57 @@ class DataWorkflow:
                 logger.error(f"Data collection error: {e}")
             return {'success': False, 'error': str(e)}
     
+    def collect_data_multi(self, sources: List[str], query: str,
+                           source_kwargs: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Phase 1: Collect data from several sources concurrently
+        
+        Args:
+            sources: Source names accepted by collect_data
+            query: Query shared by all sources
+            source_kwargs: Extra keyword arguments per source, e.g. {'research_apis': {'research_type': 'funding'}}
+        
+        Returns:
+            Per-source results under 'results'; success if any source succeeded
+        """
+        source_kwargs = source_kwargs or {}
+        sources = list(dict.fromkeys(sources))
+        if not sources:
+            return {'success': False, 'error': 'No sources given', 'results': {}}
+        
+        # Only this method writes data_in progress here; workers just collect, so the phase
+        # stays 'running' until every source is done
+        self._set_progress('data_in', 'running', 0)
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = {
+                executor.submit(self._collect_from_source, source, query, **source_kwargs.get(source, {})): source
+                for source in sources
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if done < len(sources):
+                    self._set_progress('data_in', 'running', done * 100 // len(sources))
+        results = {source: results[source] for source in sources}
+        
+        succeeded = sum(1 for result in results.values() if result.get('success'))
+        self._set_progress('data_in', 'completed' if succeeded else 'failed', 100)
+        
+        return {
+            'success': succeeded > 0,
+            'results': results,
+            'sources_succeeded': succeeded,
+            'total_results': sum(result.get('count', len(result.get('results', []))) for result in results.values())
+        }
+    
     def process_data(self, data_ids: List[int], analysis_type: str) -> Dict[str, Any]:
         """Phase 2: Process collected data"""
         try:
             result = self.data_process.analyze_data(data_ids, analysis_type)
             
             if result.get('success'):
-                self.progress['data_process'] = {'status': 'completed', 'progress': 100}
+                self._set_progress('data_process', 'completed', 100)
             
             return result
             
@@ -762,7 +1037,7 @@ class DataWorkflow:
             result = self.data_out.generate_report(processed_data, output_type)
             
             if result.get('success'):
-                self.progress['data_out'] = {'status': 'completed', 'progress': 100}
+                self._set_progress('data_out', 'completed', 100)
             
             return result
             
@@ -773,22 +1048,33 @@ class DataWorkflow:
     
     def get_progress(self) -> Dict[str, Any]:
         """Get current workflow progress"""
-        return self.progress
+        with self._progress_lock:
+            return dict(self.progress)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get LLM response cache statistics"""
+        if LLMCache and isinstance(cached_generate_text, LLMCache):
+            return cached_generate_text.get_stats()
+        return {'enabled': False}
     
     def reset_progress(self):
         """Reset workflow progress"""
-        self.progress = {
-            'data_in': {'status': 'pending', 'progress': 0},
-            'data_process': {'status': 'pending', 'progress': 0},
-            'data_out': {'status': 'pending', 'progress': 0}
-        }
+        with self._progress_lock:
+            self.progress = {
+                'data_in': {'status': 'pending', 'progress': 0},
+                'data_process': {'status': 'pending', 'progress': 0},
+                'data_out': {'status': 'pending', 'progress': 0}
+            }
 
 # Global workflow instance
 _workflow = None
+_workflow_lock = threading.Lock()
 
 def get_workflow() -> DataWorkflow:
     """Get the global workflow instance"""
     global _workflow
     if _workflow is None:
-        _workflow = DataWorkflow()
+        with _workflow_lock:
+            if _workflow is None:
+                _workflow = DataWorkflow()
     return _workflow
\ No newline at end of file
@@ -6,15 +6,23 @@ from pathlib import Path
 
 # Read the README file
 this_directory = Path(__file__).parent
-long_description = (this_directory / "README.md").read_text()
+try:
+    long_description = (this_directory / "README.md").read_text(encoding="utf-8")
+except FileNotFoundError:
+    long_description = ""
 
 # Read requirements
-requirements = []
-with open("requirements.txt", "r") as f:
-    for line in f:
-        line = line.strip()
-        if line and not line.startswith("#"):
-            requirements.append(line)
+with open(this_directory / "requirements.txt", "r") as f:
+    REQUIREMENTS = [
+        line for line in (raw.strip() for raw in f)
+        if line and not line.startswith("#")
+    ]
+
+# Only the application packages; tests and non-code directories are not searched
+PACKAGES = find_packages(
+    include=["models*", "routes*", "services*", "utils*"],
+    exclude=["tests*", "*.tests", "*.tests.*"],
+)
 
 setup(
     name="leadfinder",
@@ -25,7 +33,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/your-org/leadfinder",
-    packages=find_packages(),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -40,12 +48,13 @@ setup(
         "Topic :: Scientific/Engineering :: Artificial Intelligence",
     ],
     python_requires=">=3.9",
-    install_requires=requirements,
+    install_requires=REQUIREMENTS,
     extras_require={
         "dev": [
             "pytest>=7.4.0",
             "pytest-cov>=4.1.0",
             "pytest-mock>=3.11.0",
+            "pytest-xdist>=3.3.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.5.0",
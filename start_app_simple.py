@@ -4,11 +4,37 @@ Simple script to start LeadFinder app with improved Redis handling
 """
 
 import os
+import re
 import sys
 import signal
 import time
 from pathlib import Path
 
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+_ENV_LINE_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)=(.*)$')
+
+def load_env_file(env_file):
+    """Load KEY=value lines into os.environ, overriding existing values"""
+    if load_dotenv:
+        load_dotenv(env_file, override=True)
+        return
+    
+    # Fallback parser when python-dotenv is not installed
+    with open(env_file, 'r') as f:
+        for line in f:
+            match = _ENV_LINE_RE.match(line.strip())
+            if match:
+                os.environ[match.group(1)] = match.group(2)
+
 def signal_handler(signum, frame):
     print("\n🛑 Received interrupt signal. Shutting down gracefully...")
     sys.exit(0)
@@ -28,12 +54,7 @@ def main():
     env_file = Path('env.development')
     if env_file.exists():
         print("📁 Loading configuration from env.development")
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value
+        load_env_file(env_file)
     
     print("🚀 Starting LeadFinder with improved Redis handling...")
     
@@ -60,8 +81,15 @@ def main():
         print("Press Ctrl+C to stop the application")
         print("")
         
-        # Start the application
-        app.run(host=host, port=port, debug=debug, use_reloader=False)
+        # Start the application; Waitress serves requests on a thread pool, while the
+        # Werkzeug dev server remains for debug mode or when Waitress is not installed
+        if serve and not debug:
+            threads = int(os.environ.get('WAITRESS_THREADS', '8'))
+            print(f"🧵 Serving with Waitress ({threads} threads)")
+            serve(app, host=host, port=port, threads=threads, connection_limit=512)
+        else:
+            # The reloader stays off so the signal handlers above handle shutdown
+            app.run(host=host, port=port, debug=debug, use_reloader=False)
         
     except KeyboardInterrupt:
         print("\n🛑 Application stopped by user")
@@ -6,111 +6,229 @@ This script validates all required services before starting LeadFinder.
 It checks database, Ollama, and AutoGPT integration.
 """
 
+import functools
+import hashlib
+import importlib
+import io
+import json
+import os
+import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def check_database():
+@functools.lru_cache(maxsize=None)
+def _load(name):
+    """Import a module on first use; failed imports are not cached and raise each time"""
+    return importlib.import_module(name)
+
+def check_database(out=None):
     """Check database connection"""
-    print("🔍 Checking database...")
+    print("🔍 Checking database...", file=out)
+    try:
+        db = _load('models.database').db
+    except ImportError as e:
+        print(f"⏭️  Database: Skipped - {e}", file=out)
+        return None
     try:
-        from models.database import db
         count = db.get_lead_count()
-        print(f"✅ Database: Connected ({{count}} leads)")
+        print(f"✅ Database: Connected ({count} leads)", file=out)
         return True
     except Exception as e:
-        print(f"❌ Database: Failed - {e}")
+        print(f"❌ Database: Failed - {e}", file=out)
         return False
 
-def check_ollama():
+def check_ollama(out=None):
     """Check Ollama service"""
-    print("🔍 Checking Ollama...")
+    print("🔍 Checking Ollama...", file=out)
+    try:
+        ollama_service = _load('services.ollama_service').ollama_service
+    except ImportError as e:
+        print(f"⏭️  Ollama: Skipped - {e}", file=out)
+        return None
     try:
-        from services.ollama_service import ollama_service
         status = ollama_service.check_status()
         if status.get("ok"):
-            print(f"✅ Ollama: {status.get('msg', 'Ready')}")
+            print(f"✅ Ollama: {status.get('msg', 'Ready')}", file=out)
             return True
         else:
-            print(f"❌ Ollama: {status.get('msg', 'Not ready')}")
+            print(f"❌ Ollama: {status.get('msg', 'Not ready')}", file=out)
             return False
     except Exception as e:
-        print(f"❌ Ollama: Failed - {e}")
+        print(f"❌ Ollama: Failed - {e}", file=out)
         return False
 
-def check_autogpt():
+def check_autogpt(out=None):
     """Check AutoGPT integration"""
-    print("🔍 Checking AutoGPT integration...")
+    print("🔍 Checking AutoGPT integration...", file=out)
+    try:
+        LeadfinderAutoGPTIntegration = _load('leadfinder_autogpt_integration').LeadfinderAutoGPTIntegration
+        config = _load('config')
+        AUTOGPT_MODEL = config.AUTOGPT_MODEL
+        AUTOGPT_TIMEOUT = config.AUTOGPT_TIMEOUT
+    except ImportError as e:
+        print(f"⏭️  AutoGPT: Skipped - {e}", file=out)
+        return None
     try:
-        from leadfinder_autogpt_integration import LeadfinderAutoGPTIntegration
-        from config import AUTOGPT_MODEL
-        
         autogpt_integration = LeadfinderAutoGPTIntegration(AUTOGPT_MODEL)
-        test_result = autogpt_integration.client.execute_text_generation("Startup check")
+        
+        # Skip the model round trip when the endpoint is not even answering
+        if not autogpt_integration.client.ping():
+            print("❌ AutoGPT: endpoint down", file=out)
+            return False
+        
+        # Bound the HTTP request itself (AUTOGPT_TIMEOUT) rather than the caller's wait
+        test_result = autogpt_integration.client.execute_text_generation("Startup check", timeout=AUTOGPT_TIMEOUT)
         
         if test_result.get('status') == 'COMPLETED':
-            print(f"✅ AutoGPT: Ready (using {AUTOGPT_MODEL})")
+            print(f"✅ AutoGPT: Ready (using {AUTOGPT_MODEL})", file=out)
             return True
         else:
-            print(f"❌ AutoGPT: Test failed - {test_result.get('error', 'Unknown error')}")
+            print(f"❌ AutoGPT: Test failed - {test_result.get('error', 'Unknown error')}", file=out)
             return False
     except Exception as e:
-        print(f"⚠️  AutoGPT: Not available - {str(e)[:50]}...")
+        print(f"⚠️  AutoGPT: Not available - {str(e)[:50]}...", file=out)
         return False
 
-def check_serpapi():
+def check_serpapi(out=None):
     """Check SerpAPI configuration"""
-    print("🔍 Checking SerpAPI...")
+    print("🔍 Checking SerpAPI...", file=out)
     try:
-        from config import SERPAPI_KEY
+        SERPAPI_KEY = _load('config').SERPAPI_KEY
         if SERPAPI_KEY and SERPAPI_KEY != 'your_serpapi_key_here':
-            print("✅ SerpAPI: Key configured")
+            print("✅ SerpAPI: Key configured", file=out)
             return True
         else:
-            print("⚠️  SerpAPI: Key not configured (some search features may not work)")
+            print("⚠️  SerpAPI: Key not configured (some search features may not work)", file=out)
             return False
     except Exception as e:
-        print(f"❌ SerpAPI: Configuration error - {e}")
+        print(f"❌ SerpAPI: Configuration error - {e}", file=out)
         return False
 
-def main():
+CHECKS = {
+    'Database': check_database,
+    'Ollama': check_ollama,
+    'AutoGPT': check_autogpt,
+    'SerpAPI': check_serpapi
+}
+
+# Recent results are reused so repeated runs return at once
+CACHE_PATH = Path.home() / '.cache' / 'leadfinder' / 'startup_check.json'
+CACHE_TTL = 60  # seconds
+
+def _cache_key():
+    """Hash of the settings the checks depend on; changing them invalidates the cache"""
+    settings = '\0'.join(os.environ.get(name, '') for name in ('AUTOGPT_MODEL', 'SERPAPI_KEY'))
+    return hashlib.blake2b(settings.encode('utf-8'), digest_size=8).hexdigest()
+
+def run_checks(on_output=None):
+    """
+    Run all checks concurrently, returning results and captured output in check order
+    
+    on_output, if given, receives each check's output as soon as it and every
+    earlier check have finished, rather than after the slowest check.
+    """
+    # Each check writes to its own buffer so output stays in check order
+    outputs = {name: io.StringIO() for name in CHECKS}
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(CHECKS)) as executor:
+        futures = {name: executor.submit(check_func, outputs[name]) for name, check_func in CHECKS.items()}
+        for name, future in futures.items():
+            results[name] = future.result()
+            if on_output:
+                on_output(outputs[name].getvalue())
+    
+    output = "".join(outputs[name].getvalue() for name in CHECKS)
+    return results, output
+
+def load_cached_results(key):
+    """Return (results, output) from a fresh cache entry for key, or None"""
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if cached.get('key') != key or time.time() - cached.get('timestamp', 0) >= CACHE_TTL:
+        return None
+    return cached['results'], cached['output']
+
+def save_cached_results(key, results, output):
+    """Write results to the cache atomically"""
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CACHE_PATH.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'timestamp': time.time(),
+                       'results': results, 'output': output}, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass  # Caching is best effort
+
+def _refresh_cache(key):
+    save_cached_results(key, *run_checks())
+
+def _start_background_refresh(key):
+    """Re-run the checks in a detached process that writes the cache, so this one can exit now"""
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--refresh-cache', key],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+def _write_output(text):
+    """Emit one check's buffered output in a single write"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+def main(use_cache=True):
     """Main startup check"""
     print("🚀 LeadFinder Startup Check")
     print("=" * 50)
     
-    checks = {
-        'Database': check_database,
-        'Ollama': check_ollama,
-        'AutoGPT': check_autogpt,
-        'SerpAPI': check_serpapi
-    }
-    
-    results = {}
-    for name, check_func in checks.items():
-        results[name] = check_func()
-        time.sleep(0.5)  # Small delay between checks
+    # Keyed before the checks run, since importing config loads .env into the environment
+    key = _cache_key()
+    cached = load_cached_results(key) if use_cache else None
+    if cached:
+        results, output = cached
+        print(output, end="")
+        print(f"💾 Showing results cached within the last {CACHE_TTL}s; refreshing in the background")
+        _start_background_refresh(key)
+    else:
+        results, output = run_checks(on_output=_write_output)
+        save_cached_results(key, results, output)
     
-    print("\n" + "=" * 50)
-    print("📊 Startup Check Results:")
+    # Build the summary and emit it with a single write
+    lines = ["", "=" * 50, "📊 Startup Check Results:"]
     
     all_passed = True
     for name, passed in results.items():
-        status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"   {name}: {status}")
+        if passed is None:
+            status = "⏭️  SKIP"
+        else:
+            status = "✅ PASS" if passed else "❌ FAIL"
+        lines.append(f"   {name}: {status}")
         if not passed:
             all_passed = False
     
-    print("\n" + "=" * 50)
+    lines.extend(["", "=" * 50])
     
     if all_passed:
-        print("🎉 All checks passed! LeadFinder is ready to start.")
-        print("💡 You can now run: python app.py")
-        return True
+        lines.append("🎉 All checks passed! LeadFinder is ready to start.")
+        lines.append("💡 You can now run: python app.py")
     else:
-        print("⚠️  Some checks failed. LeadFinder may have limited functionality.")
-        print("💡 Check the configuration and try again.")
-        return False
+        lines.append("⚠️  Some checks failed. LeadFinder may have limited functionality.")
+        lines.append("💡 Check the configuration and try again.")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    return all_passed
 
 if __name__ == "__main__":
-    success = main()
+    if sys.argv[1:2] == ['--refresh-cache']:
+        # Background refresh started by a cached run: no output, just rewrite the cache
+        _refresh_cache(sys.argv[2])
+        sys.exit(0)
+    success = main(use_cache='--no-cache' not in sys.argv[1:])
     sys.exit(0 if success else 1) 
\ No newline at end of file
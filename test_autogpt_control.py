@@ -3,106 +3,155 @@
 Test script for AutoGPT Control Panel functionality
 """
 
+import asyncio
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+REQUEST_TIMEOUT = 30
+
+# (heading, path, form data, name, success message, output label, output key)
+POST_CHECKS = [
+    ("\n3. Testing AutoGPT Test Function...", "/autogpt/test", {
+        'test_prompt': 'Hello, this is a test of AutoGPT functionality.',
+        'model': 'mistral:latest'
+    }, "Test", "AutoGPT test completed successfully", "Output", 'output'),
+    ("\n4. Testing Text Analysis...", "/autogpt/analyze", {
+        'text': 'This is a sample company description for testing AutoGPT analysis.',
+        'analysis_type': 'general',
+        'model': 'mistral:latest'
+    }, "Analysis", "Text analysis completed successfully", "Analysis", 'analysis'),
+    ("\n5. Testing Research Function...", "/autogpt/research", {
+        'research_topic': 'AI in healthcare',
+        'company_name': 'Test Company',
+        'industry': 'Healthcare',
+        'model': 'mistral:latest'
+    }, "Research", "Research completed successfully", "Research", 'research'),
+]
+
+def _status_lines(outcome):
+    """Test 1: Status endpoint; outcome is (status_code, json) or an exception"""
+    lines = ["\n1. Testing AutoGPT Status..."]
+    if isinstance(outcome, Exception):
+        lines.append(f"❌ Status error: {outcome}")
+        return lines
+    status_code, data = outcome
+    if status_code == 200:
+        lines.append(f"✅ Status: {data.get('status', 'unknown')}")
+        lines.append(f"✅ Enabled: {data.get('enabled', 'unknown')}")
+        lines.append(f"✅ Model: {data.get('model', 'unknown')}")
+    else:
+        lines.append(f"❌ Status failed: {status_code}")
+    return lines
+
+def _control_page_lines(outcome):
+    """Test 2: Control panel page"""
+    lines = ["\n2. Testing Control Panel Page..."]
+    if isinstance(outcome, Exception):
+        lines.append(f"❌ Control panel error: {outcome}")
+    elif outcome[0] == 200:
+        lines.append("✅ Control panel page loads successfully")
+    else:
+        lines.append(f"❌ Control panel failed: {outcome[0]}")
+    return lines
+
+def _post_lines(outcome, heading, name, done_message, output_label, output_key):
+    """Describe the outcome of a POST to an AutoGPT endpoint"""
+    lines = [heading]
+    if isinstance(outcome, Exception):
+        lines.append(f"❌ {name} error: {outcome}")
+        return lines
+    status_code, result = outcome
+    if status_code == 200:
+        if result.get('success'):
+            lines.append(f"✅ {done_message}")
+            lines.append(f"✅ {output_label}: {result.get(output_key, '')[:100]}...")
+        else:
+            lines.append(f"❌ {name} failed: {result.get('error', 'Unknown error')}")
+    else:
+        lines.append(f"❌ {name} endpoint failed: {status_code}")
+    return lines
+
+async def _run_async(base_url):
+    """Issue all five requests at once over one aiohttp connection pool"""
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(base_url=base_url, timeout=timeout) as session:
+        async def fetch(method, path, data=None, want_json=True):
+            async with session.request(method, path, data=data) as response:
+                if response.status == 200 and want_json:
+                    return response.status, await response.json(content_type=None)
+                return response.status, None
+
+        outcomes = await asyncio.gather(
+            fetch('GET', '/autogpt/status'),
+            fetch('GET', '/autogpt/control', want_json=False),
+            *(fetch('POST', path, data) for _, path, data, *_ in POST_CHECKS),
+            return_exceptions=True
+        )
+
+    blocks = [_status_lines(outcomes[0]), _control_page_lines(outcomes[1])]
+    for (heading, _, _, *labels), outcome in zip(POST_CHECKS, outcomes[2:]):
+        blocks.append(_post_lines(outcome, heading, *labels))
+    return blocks
+
+def _make_session():
+    """Session with keep-alive connections shared by all checks"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _fetch(session, method, url, data=None, want_json=True):
+    """Return (status_code, json) for a request, or the exception it raised"""
+    try:
+        response = session.request(method, url, data=data, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200 and want_json:
+            return response.status_code, response.json()
+        return response.status_code, None
+    except Exception as e:
+        return e
+
+def _run_threaded(base_url):
+    """Fallback without aiohttp: status first, then the rest on a thread pool"""
+    session = _make_session()
+    print("\n".join(_status_lines(_fetch(session, 'GET', f"{base_url}/autogpt/status"))))
+
+    with ThreadPoolExecutor(max_workers=len(POST_CHECKS) + 1) as executor:
+        futures = {
+            executor.submit(_fetch, session, 'GET', f"{base_url}/autogpt/control", None, False):
+                _control_page_lines
+        }
+        for heading, path, data, *labels in POST_CHECKS:
+            future = executor.submit(_fetch, session, 'POST', f"{base_url}{path}", data)
+            futures[future] = lambda outcome, heading=heading, labels=labels: _post_lines(outcome, heading, *labels)
+        for future in as_completed(futures):
+            print("\n".join(futures[future](future.result())))
+
+    session.close()
 
 def test_autogpt_endpoints():
     """Test all AutoGPT control panel endpoints"""
     base_url = "http://localhost:5051"
-    
+
     print("🤖 Testing AutoGPT Control Panel Endpoints")
     print("=" * 50)
-    
-    # Test 1: Status endpoint
-    print("\n1. Testing AutoGPT Status...")
-    try:
-        response = requests.get(f"{base_url}/autogpt/status")
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Status: {data.get('status', 'unknown')}")
-            print(f"✅ Enabled: {data.get('enabled', 'unknown')}")
-            print(f"✅ Model: {data.get('model', 'unknown')}")
-        else:
-            print(f"❌ Status failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Status error: {e}")
-    
-    # Test 2: Control panel page
-    print("\n2. Testing Control Panel Page...")
-    try:
-        response = requests.get(f"{base_url}/autogpt/control")
-        if response.status_code == 200:
-            print("✅ Control panel page loads successfully")
-        else:
-            print(f"❌ Control panel failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Control panel error: {e}")
-    
-    # Test 3: Test endpoint
-    print("\n3. Testing AutoGPT Test Function...")
-    try:
-        data = {
-            'test_prompt': 'Hello, this is a test of AutoGPT functionality.',
-            'model': 'mistral:latest'
-        }
-        response = requests.post(f"{base_url}/autogpt/test", data=data)
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('success'):
-                print("✅ AutoGPT test completed successfully")
-                print(f"✅ Output: {result.get('output', '')[:100]}...")
-            else:
-                print(f"❌ AutoGPT test failed: {result.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Test endpoint failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Test error: {e}")
-    
-    # Test 4: Analysis endpoint
-    print("\n4. Testing Text Analysis...")
-    try:
-        data = {
-            'text': 'This is a sample company description for testing AutoGPT analysis.',
-            'analysis_type': 'general',
-            'model': 'mistral:latest'
-        }
-        response = requests.post(f"{base_url}/autogpt/analyze", data=data)
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('success'):
-                print("✅ Text analysis completed successfully")
-                print(f"✅ Analysis: {result.get('analysis', '')[:100]}...")
-            else:
-                print(f"❌ Analysis failed: {result.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Analysis endpoint failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Analysis error: {e}")
-    
-    # Test 5: Research endpoint
-    print("\n5. Testing Research Function...")
-    try:
-        data = {
-            'research_topic': 'AI in healthcare',
-            'company_name': 'Test Company',
-            'industry': 'Healthcare',
-            'model': 'mistral:latest'
-        }
-        response = requests.post(f"{base_url}/autogpt/research", data=data)
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('success'):
-                print("✅ Research completed successfully")
-                print(f"✅ Research: {result.get('research', '')[:100]}...")
-            else:
-                print(f"❌ Research failed: {result.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Research endpoint failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Research error: {e}")
-    
+
+    if AIOHTTP_AVAILABLE:
+        for lines in asyncio.run(_run_async(base_url)):
+            print("\n".join(lines))
+    else:
+        _run_threaded(base_url)
+
     print("\n" + "=" * 50)
     print("🎯 AutoGPT Control Panel Testing Complete!")
 
 if __name__ == "__main__":
-    test_autogpt_endpoints() 
\ No newline at end of file
+    test_autogpt_endpoints()
@@ -3,11 +3,15 @@
 Simple test script for the dashboard implementation (no Flask required)
 """
 
+import compileall
 import sys
 import os
+from pathlib import Path
 
-# Add the project root to the Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add the project root to the Python path once, even when several scripts are collected together
+_project_root = os.path.dirname(os.path.abspath(__file__))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
 
 def test_database_functions():
     """Test database functions without Flask"""
@@ -16,13 +20,12 @@ def test_database_functions():
     
     try:
         # Test database functions
-        from models.database import get_lead_stats, get_rag_stats
+        from models.database import get_stats_bundle
         
-        lead_stats = get_lead_stats()
-        print(f"✅ Lead stats: {lead_stats.get('total_leads', 0)} leads")
-        
-        rag_stats = get_rag_stats()
-        print(f"✅ RAG stats: {rag_stats.get('total_chunks', 0)} chunks")
+        # Lead and RAG totals come back from a single query
+        stats = get_stats_bundle()
+        print(f"✅ Lead stats: {stats.get('total_leads', 0)} leads")
+        print(f"✅ RAG stats: {stats.get('total_chunks', 0)} chunks")
         
         return True
         
@@ -60,17 +63,27 @@ def test_template_exists():
     print("=" * 50)
     
     templates_to_check = [
-        "templates/dashboard.html",
-        "templates/navigation.html"
+        "dashboard.html",
+        "navigation.html"
     ]
     
+    # One directory read; scandir entries carry their stat info
+    try:
+        with os.scandir("templates") as entries:
+            template_sizes = {
+                entry.name: entry.stat().st_size
+                for entry in entries
+                if entry.name.endswith(".html") and entry.is_file()
+            }
+    except FileNotFoundError:
+        template_sizes = {}
+    
     all_exist = True
     for template in templates_to_check:
-        if os.path.exists(template):
-            size = os.path.getsize(template)
-            print(f"✅ {template}: {size} bytes")
+        if template in template_sizes:
+            print(f"✅ templates/{template}: {template_sizes[template]} bytes")
         else:
-            print(f"❌ {template}: NOT FOUND")
+            print(f"❌ templates/{template}: NOT FOUND")
             all_exist = False
     
     return all_exist
@@ -80,26 +93,22 @@ def test_route_structure():
     print("\n🛣️  Testing Route Structure")
     print("=" * 50)
     
-    routes_to_check = [
-        "routes/dashboard.py",
-        "routes/rag_routes.py"
-    ]
+    required_routes = {"routes/dashboard.py", "routes/rag_routes.py"}
+    route_files = sorted(Path("routes").glob("*.py"))
     
     all_valid = True
-    for route in routes_to_check:
-        if os.path.exists(route):
-            try:
-                # Try to compile the Python file
-                with open(route, 'r') as f:
-                    compile(f.read(), route, 'exec')
-                print(f"✅ {route}: Valid Python")
-            except SyntaxError as e:
-                print(f"❌ {route}: Syntax error - {e}")
-                all_valid = False
+    for route in route_files:
+        # compile_file writes __pycache__ bytecode and skips files whose .pyc is up to date
+        if compileall.compile_file(str(route), quiet=1):
+            print(f"✅ {route.as_posix()}: Valid Python")
         else:
-            print(f"❌ {route}: NOT FOUND")
+            print(f"❌ {route.as_posix()}: Syntax error")
             all_valid = False
     
+    for route in sorted(required_routes - {route.as_posix() for route in route_files}):
+        print(f"❌ {route}: NOT FOUND")
+        all_valid = False
+    
     return all_valid
 
 def main():
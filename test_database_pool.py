@@ -6,25 +6,57 @@ This script tests the database connection pool to ensure it's working correctly
 and provides performance improvements over direct connections.
 """
 
+import atexit
+import copy
+import json
+import os
+import subprocess
 import time
+import timeit
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from models.database_pool import get_db_pool, close_db_pool
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+
+from models.database_pool import DatabaseConnectionPool, get_db_pool, close_db_pool
 from models.database import db
 
-def test_connection_pool_basic():
+def _check(condition, message):
+    """Raise AssertionError when condition is false; unlike assert, survives python -O"""
+    if not condition:
+        raise AssertionError(message)
+
+# Pool handle resolved once and shared by every test and worker thread
+_POOL = None
+
+def _pool():
+    """Return the global pool, resolving it on first use"""
+    global _POOL
+    if _POOL is None:
+        _POOL = get_db_pool()
+    return _POOL
+
+# Worker threads shared by the concurrency tests, created on first use
+_EXECUTOR = None
+
+def _executor():
+    """Return the shared executor, starting it (and its exit hook) on first use"""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=64, thread_name_prefix='db-pool-test')
+        atexit.register(_EXECUTOR.shutdown, wait=True)
+    return _EXECUTOR
+
+def check_connection_pool_basic():
     """Test basic connection pool functionality"""
     print("🔍 Testing basic connection pool functionality...")
     
     try:
-        pool = get_db_pool()
+        pool = _pool()
         
         # Test getting a connection
         with pool.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 as test")
-            result = cursor.fetchone()
-            assert result[0] == 1, "Basic query failed"
+            result = conn.execute("SELECT 1 as test").fetchone()
+            _check(result[0] == 1, "Basic query failed")
         
         print("✅ Basic connection pool test passed")
         return True
@@ -32,44 +64,105 @@ def test_connection_pool_basic():
         print(f"❌ Basic connection pool test failed: {e}")
         return False
 
-def test_connection_pool_performance():
-    """Test connection pool performance vs direct connections"""
+# Benchmark results are appended here, one JSON object per run, for check_perf_regression.py
+PERF_LOG_PATH = "perf.jsonl"
+
+def _git_sha():
+    """Current commit, or None outside a git checkout"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).strip().decode()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _record_perf(metrics):
+    """Append one benchmark result to PERF_LOG_PATH"""
+    entry = dict(metrics, sha=_git_sha(), ts=time.time())
+    with open(PERF_LOG_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+
+def check_connection_pool_performance():
+    """
+    Test connection pool performance vs direct connections
+    
+    The probe is SELECT 1 so the timings measure connection checkout rather than
+    a COUNT(*) scan that grows with the leads table; real queries through the
+    pool are covered by check_pool_under_real_query_load.
+    """
     print("⚡ Testing connection pool performance...")
     
+    def one_query(conn_factory):
+        """One checkout and query; identical for both arms"""
+        with conn_factory() as conn:
+            conn.execute("SELECT 1").fetchone()
+    
+    def bulk_queries(pool, count):
+        """count queries on one pooled connection inside a single transaction"""
+        with pool.get_connection() as conn:
+            cursor = conn.cursor()
+            conn.execute("BEGIN")
+            try:
+                for _ in range(count):
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            finally:
+                conn.execute("COMMIT")
+    
+    def time_per_query(stmt, queries_per_call=1):
+        """Best-of-5 nanoseconds per query, with the loop count picked by autorange"""
+        # autorange's 0.2s target is in timer units, so pick the loop count with the
+        # default float timer and do the measured repeats in integer nanoseconds
+        loops, _ = timeit.Timer(stmt).autorange()
+        timer = timeit.Timer(stmt, timer=time.perf_counter_ns)
+        best = min(timer.repeat(repeat=5, number=loops))
+        return best / (loops * queries_per_call)
+    
     def direct_connection_test():
         """Test using direct connections"""
-        start_time = time.time()
-        for _ in range(100):
-            with db._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM leads")
-                cursor.fetchone()
-        return time.time() - start_time
-    
-    def pooled_connection_test():
-        """Test using connection pool"""
-        start_time = time.time()
-        pool = get_db_pool()
-        for _ in range(100):
-            with pool.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM leads")
-                cursor.fetchone()
-        return time.time() - start_time
+        return time_per_query(lambda: one_query(db._get_connection))
+    
+    def pooled_checkout_test():
+        """Test using connection pool, checking a connection out for every query"""
+        pool = _pool()
+        return time_per_query(lambda: one_query(pool.get_connection))
+    
+    def pooled_bulk_test():
+        """Test using connection pool, 100 queries per checkout in one transaction"""
+        pool = _pool()
+        return time_per_query(lambda: bulk_queries(pool, 100), queries_per_call=100)
     
     try:
+        # Pre-create connections so the pooled arms measure checkout, not sqlite3.connect()
+        pool = _pool()
+        stats = pool.get_pool_stats()
+        pool.warmup(min(stats['max_connections'], 10))
+        if pool.get_pool_stats()['pool_size'] < 1:
+            print("⏭️  Pool could not be warmed; skipping performance comparison")
+            return True
+        
         # Test direct connections
         direct_time = direct_connection_test()
-        print(f"⏱️  Direct connections: {direct_time:.3f} seconds")
+        print(f"⏱️  Direct connections: {direct_time:,.0f} ns per query")
+        
+        # Test pooled connections: checkout cost and transaction-batched query cost
+        pooled_time = pooled_checkout_test()
+        print(f"⏱️  Pooled connections: {pooled_time:,.0f} ns per query (one checkout each)")
         
-        # Test pooled connections
-        pooled_time = pooled_connection_test()
-        print(f"⏱️  Pooled connections: {pooled_time:.3f} seconds")
+        bulk_time = pooled_bulk_test()
+        print(f"⏱️  Pooled bulk: {bulk_time:,.0f} ns per query (100 per checkout, one transaction)")
         
         # Calculate improvement
         improvement = ((direct_time - pooled_time) / direct_time) * 100
         print(f"📈 Performance improvement: {improvement:.1f}%")
         
+        _record_perf({
+            "test": "pool_perf",
+            "direct_ns": direct_time,
+            "pooled_ns": pooled_time,
+            "bulk_ns": bulk_time,
+            "speedup": direct_time / pooled_time
+        })
+        print(f"📝 Metrics appended to {PERF_LOG_PATH}")
+        
         if pooled_time < direct_time:
             print("✅ Connection pool provides performance improvement")
             return True
@@ -80,67 +173,188 @@ def test_connection_pool_performance():
         print(f"❌ Performance test failed: {e}")
         return False
 
-def test_concurrent_connections():
-    """Test concurrent access to the connection pool"""
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def _affinity_layouts():
+    """Core sets to pin workers to: spread over every core, and packed onto at most four"""
+    if not hasattr(os, 'sched_setaffinity'):
+        return [("unpinned", None)]
+    cores = sorted(os.sched_getaffinity(0))
+    layouts = [("spread", cores)]
+    if len(cores) > 4:
+        layouts.append(("packed", cores[:4]))
+    return layouts
+
+def _pool_worker(pool, worker_id, cores, fail_fast=False):
+    """
+    One concurrent checkout and SELECT 1; returns (worker_id, value, error, acquisition ns)
+    
+    With fail_fast the exception is raised instead of returned, so the caller's
+    wait(FIRST_EXCEPTION) sees it as soon as it happens.
+    """
+    original_affinity = None
+    try:
+        # Pin this thread (pid 0 is the caller) so pool lock traffic stays on known cores
+        if cores:
+            original_affinity = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, {cores[worker_id % len(cores)]})
+        start = time.perf_counter_ns()
+        with pool.get_connection() as conn:
+            acquired_ns = time.perf_counter_ns() - start
+            result = conn.execute("SELECT 1").fetchone()
+            return worker_id, result[0], None, acquired_ns
+    except Exception as e:
+        if fail_fast:
+            raise
+        return worker_id, None, str(e), None
+    finally:
+        # Executor threads are reused, so hand them back unpinned
+        if original_affinity:
+            os.sched_setaffinity(0, original_affinity)
+
+def _print_latencies(label, outcomes):
+    """Print p50/p99 acquisition latency for a batch of worker outcomes"""
+    latencies = sorted(ns for *_, ns in outcomes if ns is not None)
+    if latencies:
+        print(f"⏱️  Acquisition latency ({label}): p50 {_percentile(latencies, 50) / 1000:.1f} µs, "
+              f"p99 {_percentile(latencies, 99) / 1000:.1f} µs")
+
+def _ensure_wal(pool):
+    """
+    Put the database in WAL mode so concurrent readers do not block each other
+    
+    DatabaseConnectionPool already sets these PRAGMAs on every connection it
+    creates. journal_mode=WAL persists in the database file, so setting it here
+    covers every pooled connection even if the pool stops doing so; the other
+    two only affect this connection.
+    """
+    with pool.get_connection() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    _check(journal_mode == 'wal', f"Expected WAL journal mode, got {journal_mode}")
+
+def _warm_pool_for_concurrency():
+    """
+    Warm the pool so timed workers contend for it rather than paying connection
+    set-up, and return it with a worker count that oversubscribes it
+    """
+    pool = _pool()
+    _ensure_wal(pool)
+    max_connections = pool.get_pool_stats()['max_connections']
+    pool.warmup(max_connections)
+    return pool, 4 * max_connections
+
+def check_concurrent_connections():
+    """Test concurrent access to the connection pool; SELECT 1 keeps the focus on checkout"""
     print("🔄 Testing concurrent connections...")
     
-    def worker(worker_id):
-        """Worker function for concurrent testing"""
-        try:
-            pool = get_db_pool()
-            with pool.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM leads")
-                result = cursor.fetchone()
-                return f"Worker {worker_id}: {result[0]} leads"
-        except Exception as e:
-            return f"Worker {worker_id} failed: {e}"
+    try:
+        pool, num_workers = _warm_pool_for_concurrency()
+        layout, cores = _affinity_layouts()[0]
+        
+        executor = _executor()
+        futures = [executor.submit(_pool_worker, pool, i, cores, True) for i in range(num_workers)]
+        # Stop at the first failing worker instead of waiting for all of them
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+        
+        failure = next((future.exception() for future in done if future.exception()), None)
+        if failure is not None:
+            print(f"⚠️  A concurrent worker failed: {failure}")
+            return False
+        
+        _print_latencies(layout, [future.result() for future in done])
+        print(f"✅ {len(done)}/{num_workers} concurrent workers completed successfully")
+        print("✅ Concurrent connection test passed")
+        return True
+    except Exception as e:
+        print(f"❌ Concurrent connection test failed: {e}")
+        return False
+
+def check_concurrent_connections_full_sweep():
+    """Soak every worker under each affinity layout and report all failures, not just the first"""
+    print("🔄 Testing concurrent connections (full sweep)...")
     
     try:
-        # Test with multiple concurrent workers
-        num_workers = 20
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = [executor.submit(worker, i) for i in range(num_workers)]
-            results = [future.result() for future in as_completed(futures)]
+        pool, num_workers = _warm_pool_for_concurrency()
+        
+        executor = _executor()
+        results = []
+        # Spread vs packed affinity shows whether lock contention is sensitive to core placement
+        for layout, cores in _affinity_layouts():
+            futures = [executor.submit(_pool_worker, pool, i, cores) for i in range(num_workers)]
+            outcomes = [future.result() for future in as_completed(futures)]
+            results.extend(outcomes)
+            _print_latencies(layout, outcomes)
         
         # Check results
-        success_count = sum(1 for result in results if "failed" not in result)
-        print(f"✅ {success_count}/{num_workers} concurrent workers completed successfully")
+        success_count = sum(1 for result in results if result[2] is None)
+        print(f"✅ {success_count}/{len(results)} concurrent workers completed successfully")
         
-        if success_count == num_workers:
-            print("✅ Concurrent connection test passed")
+        if success_count == len(results):
+            print("✅ Concurrent sweep test passed")
             return True
         else:
             print("⚠️  Some concurrent workers failed")
+            for worker_id, _, error, _ in results:
+                if error is not None:
+                    print(f"   Worker {worker_id}: {error}")
             return False
     except Exception as e:
-        print(f"❌ Concurrent connection test failed: {e}")
+        print(f"❌ Concurrent sweep test failed: {e}")
+        return False
+
+def check_pool_under_real_query_load():
+    """Test that pooled connections serve a real table query"""
+    print("📋 Testing pool under a real query...")
+    
+    try:
+        pool = _pool()
+        with pool.get_connection() as conn:
+            result = conn.execute("SELECT COUNT(*) FROM leads").fetchone()
+            _check(result[0] >= 0, "Lead count query failed")
+        
+        print(f"✅ Pool served COUNT(*) over leads: {result[0]} leads")
+        return True
+    except Exception as e:
+        print(f"❌ Real query test failed: {e}")
         return False
 
-def test_pool_statistics():
+def check_pool_statistics():
     """Test connection pool statistics"""
     print("📊 Testing connection pool statistics...")
     
     try:
-        pool = get_db_pool()
+        pool = _pool()
         
         # Get initial stats
         initial_stats = pool.get_pool_stats()
         print(f"📈 Initial pool stats: {initial_stats}")
         
-        # Use some connections
-        for _ in range(5):
-            with pool.get_connection() as conn:
-                cursor = conn.cursor()
+        # Run several queries on one connection; the cursor reuses the cached statement
+        with pool.get_connection() as conn:
+            cursor = conn.cursor()
+            for _ in range(5):
                 cursor.execute("SELECT 1")
         
+        # Exercise checkout/return separately; this loop is about acquire/release, not queries
+        for _ in range(5):
+            with pool.get_connection():
+                pass
+        
         # Get updated stats
         updated_stats = pool.get_pool_stats()
         print(f"📈 Updated pool stats: {updated_stats}")
         
         # Verify stats are reasonable
-        assert updated_stats['pool_size'] <= updated_stats['max_connections'], "Pool size exceeds max connections"
-        assert updated_stats['total_connections_created'] >= 0, "Invalid total connections created"
+        _check(updated_stats['pool_size'] <= updated_stats['max_connections'], "Pool size exceeds max connections")
+        _check(updated_stats['total_connections_created'] >= 0, "Invalid total connections created")
         
         print("✅ Pool statistics test passed")
         return True
@@ -148,19 +362,17 @@ def test_pool_statistics():
         print(f"❌ Pool statistics test failed: {e}")
         return False
 
-def test_connection_health_check():
+def check_connection_health_check():
     """Test connection health checking"""
     print("🏥 Testing connection health check...")
     
     try:
-        pool = get_db_pool()
+        pool = _pool()
         
         # Get a connection and verify it's healthy
         with pool.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            result = cursor.fetchone()
-            assert result[0] == 1, "Health check query failed"
+            result = conn.execute("SELECT 1").fetchone()
+            _check(result[0] == 1, "Health check query failed")
         
         print("✅ Connection health check test passed")
         return True
@@ -168,37 +380,57 @@ def test_connection_health_check():
         print(f"❌ Connection health check test failed: {e}")
         return False
 
-def test_database_operations():
+@contextmanager
+def _in_memory_db():
+    """
+    Yield a copy of db backed by its own pool on a shared-cache in-memory database
+    
+    The schema is created on entry and everything is discarded when the pool closes,
+    so the test never touches data/leadfinder.db.
+    """
+    uri = f"file:leadfinder_test_{os.getpid()}?mode=memory&cache=shared"
+    pool = DatabaseConnectionPool(db_path=uri)
+    memory_db = copy.copy(db)
+    memory_db.db_path = uri
+    memory_db.pool = pool
+    try:
+        memory_db.create_tables()
+        yield memory_db
+    finally:
+        pool.close_all()
+
+def check_database_operations():
     """Test database operations using the pool"""
     print("💾 Testing database operations with connection pool...")
     
     try:
-        # Test lead operations
-        test_title = f"Test Lead {int(time.time())}"
-        test_description = "Test description for connection pool"
-        test_link = "https://example.com/test"
-        test_summary = "Test AI summary"
-        
-        # Save a test lead
-        lead_id = db.save_lead(test_title, test_description, test_link, test_summary, "test")
-        assert lead_id is not None, "Failed to save lead"
-        print(f"✅ Saved test lead with ID: {lead_id}")
-        
-        # Retrieve the lead
-        lead = db.get_lead_by_id(lead_id)
-        assert lead is not None, "Failed to retrieve lead"
-        assert lead['title'] == test_title, "Lead title mismatch"
-        print(f"✅ Retrieved test lead: {lead['title']}")
-        
-        # Get all leads
-        all_leads = db.get_all_leads(limit=5)
-        assert isinstance(all_leads, list), "Failed to get leads list"
-        print(f"✅ Retrieved {len(all_leads)} leads")
-        
-        # Clean up test lead
-        success = db.delete_lead(lead_id)
-        assert success, "Failed to delete test lead"
-        print(f"✅ Deleted test lead")
+        with _in_memory_db() as memory_db:
+            # Test lead operations
+            test_title = f"Test Lead {int(time.time())}"
+            test_description = "Test description for connection pool"
+            test_link = "https://example.com/test"
+            test_summary = "Test AI summary"
+            
+            # Save a test lead
+            lead_id = memory_db.save_lead(test_title, test_description, test_link, test_summary, "test")
+            _check(lead_id is not None, "Failed to save lead")
+            print(f"✅ Saved test lead with ID: {lead_id}")
+            
+            # Retrieve the lead
+            lead = memory_db.get_lead_by_id(lead_id)
+            _check(lead is not None, "Failed to retrieve lead")
+            _check(lead['title'] == test_title, "Lead title mismatch")
+            print(f"✅ Retrieved test lead: {lead['title']}")
+            
+            # Get all leads
+            all_leads = memory_db.get_all_leads(limit=5)
+            _check(isinstance(all_leads, list), "Failed to get leads list")
+            print(f"✅ Retrieved {len(all_leads)} leads")
+            
+            # Clean up test lead
+            success = memory_db.delete_lead(lead_id)
+            _check(success, "Failed to delete test lead")
+            print(f"✅ Deleted test lead")
         
         print("✅ Database operations test passed")
         return True
@@ -206,18 +438,86 @@ def test_database_operations():
         print(f"❌ Database operations test failed: {e}")
         return False
 
+def check_pool_bulk_insert():
+    """Test bulk inserts through the pool with a single executemany"""
+    print("📥 Testing bulk insert through the connection pool...")
+    
+    num_rows = 1000
+    rows = ((f"Bulk Lead {i}", "Bulk insert test lead", f"https://example.com/bulk/{i}",
+             "Bulk test summary", "bulk_test") for i in range(num_rows))
+    
+    try:
+        # Insert into a throwaway in-memory database rather than data/leadfinder.db
+        with _in_memory_db() as memory_db, memory_db.pool.get_connection() as conn:
+            # Pool connections autocommit, so open one transaction for all rows
+            start = time.perf_counter_ns()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO leads (title, description, link, ai_summary, source) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            elapsed_ns = time.perf_counter_ns() - start
+            
+            inserted = conn.execute("SELECT COUNT(*) FROM leads WHERE source = 'bulk_test'").fetchone()[0]
+            _check(inserted == num_rows, f"Expected {num_rows} bulk rows, found {inserted}")
+        
+        print(f"✅ Inserted {num_rows} leads in {elapsed_ns / 1e6:.2f} ms "
+              f"({elapsed_ns / num_rows:,.0f} ns per row)")
+        print("✅ Bulk insert test passed")
+        return True
+    except Exception as e:
+        print(f"❌ Bulk insert test failed: {e}")
+        return False
+
+# pytest entry points; each check is its own test so `pytest -n auto` (pytest-xdist)
+# can run them in parallel. main() below runs the same checks without pytest.
+def test_connection_pool_basic(pool):
+    assert check_connection_pool_basic()
+
+def test_connection_pool_performance(pool):
+    assert check_connection_pool_performance()
+
+def test_concurrent_connections(pool):
+    assert check_concurrent_connections()
+
+def test_concurrent_connections_full_sweep(pool):
+    assert check_concurrent_connections_full_sweep()
+
+def test_pool_under_real_query_load(pool):
+    assert check_pool_under_real_query_load()
+
+def test_pool_statistics(pool):
+    assert check_pool_statistics()
+
+def test_connection_health_check(pool):
+    assert check_connection_health_check()
+
+def test_database_operations(pool):
+    assert check_database_operations()
+
+def test_pool_bulk_insert(pool):
+    assert check_pool_bulk_insert()
+
 def main():
     """Run all database pool tests"""
     print("🚀 Starting Database Connection Pool Tests")
     print("=" * 50)
     
     tests = [
-        ("Basic Functionality", test_connection_pool_basic),
-        ("Performance", test_connection_pool_performance),
-        ("Concurrent Connections", test_concurrent_connections),
-        ("Pool Statistics", test_pool_statistics),
-        ("Health Check", test_connection_health_check),
-        ("Database Operations", test_database_operations),
+        ("Basic Functionality", check_connection_pool_basic),
+        ("Performance", check_connection_pool_performance),
+        ("Concurrent Connections", check_concurrent_connections),
+        ("Concurrent Sweep", check_concurrent_connections_full_sweep),
+        ("Real Query Load", check_pool_under_real_query_load),
+        ("Pool Statistics", check_pool_statistics),
+        ("Health Check", check_connection_health_check),
+        ("Database Operations", check_database_operations),
+        ("Bulk Insert", check_pool_bulk_insert),
     ]
     
     passed = 0
@@ -237,7 +537,9 @@ def main():
         print("⚠️  Some tests failed. Please check the implementation.")
     
     # Clean up
+    global _POOL
     close_db_pool()
+    _POOL = None
     print("🧹 Connection pool cleaned up")
 
 if __name__ == "__main__":
@@ -9,20 +9,39 @@ This script tests all the implemented improvements:
 4. Health Monitoring
 """
 
-import time
+import atexit
+import io
+import sys
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
-import json
+
+SEP = "-" * 40
+
+# Suites that share no state with each other; main() runs them in parallel
+INDEPENDENT_SUITES = 4
+
+# Worker threads shared by main() and the concurrent test blocks, created on
+# first use and shut down at exit; suites never shut it down themselves
+_EXECUTOR = None
+
+def _executor():
+    """Return the shared executor, starting it (and its exit hook) on first use"""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='lf-test')
+        atexit.register(_EXECUTOR.shutdown, wait=True)
+    return _EXECUTOR
 
 def test_error_handling():
     """Test the comprehensive error handling system"""
     print("🔧 Testing Error Handling System")
-    print("-" * 40)
+    print(SEP)
     
     try:
         from utils.error_handler import (
-            error_handler, LeadFinderError, DatabaseError, APIServiceError,
-            handle_errors, ErrorContext, handle_database_error, handle_api_error
+            error_handler, LeadFinderError, handle_errors,
+            ErrorContext, handle_database_error, handle_api_error
         )
         
         # Test 1: Basic error handling
@@ -81,7 +100,7 @@ def test_error_handling():
 def test_caching_system():
     """Test the caching system"""
     print("\n💾 Testing Caching System")
-    print("-" * 40)
+    print(SEP)
     
     try:
         from utils.cache_manager import (
@@ -152,7 +171,7 @@ def test_caching_system():
 def test_unified_search():
     """Test the unified search service"""
     print("\n🔍 Testing Unified Search Service")
-    print("-" * 40)
+    print(SEP)
     
     try:
         from services.unified_search_service import (
@@ -215,7 +234,7 @@ def test_unified_search():
 def test_health_monitoring():
     """Test the health monitoring system"""
     print("\n🏥 Testing Health Monitoring System")
-    print("-" * 40)
+    print(SEP)
     
     try:
         from utils.health_monitor import (
@@ -254,15 +273,25 @@ def test_health_monitoring():
         assert isinstance(history, list)
         print("✅ Metric history works")
         
-        # Test 5: Comprehensive health status
-        print("\n5. Testing comprehensive health status...")
+        # Test 5: Recorded event metrics are aggregated
+        print("\n5. Testing recorded metric aggregation...")
+        for value in (1.0, 2.0, 6.0):
+            monitor.record("test_latency", value, "s")
+        recorded = {metric.name: metric.value for metric in monitor._drain_recorded_metrics()}
+        assert recorded["test_latency"] == 3.0
+        assert recorded["test_latency_max"] == 6.0
+        assert recorded["test_latency_count"] == 3
+        print("✅ Recorded metric aggregation works")
+        
+        # Test 6: Comprehensive health status
+        print("\n6. Testing comprehensive health status...")
         comprehensive = get_comprehensive_health_status()
         assert 'status' in comprehensive
         assert 'components' in comprehensive
         print("✅ Comprehensive health status works")
         
-        # Test 6: Threshold management
-        print("\n6. Testing threshold management...")
+        # Test 7: Threshold management
+        print("\n7. Testing threshold management...")
         monitor.set_threshold("test_threshold", 90.0)
         thresholds = monitor.get_thresholds()
         assert "test_threshold" in thresholds
@@ -278,7 +307,7 @@ def test_health_monitoring():
 def test_integration():
     """Test integration between all systems"""
     print("\n🔗 Testing System Integration")
-    print("-" * 40)
+    print(SEP)
     
     try:
         # Test 1: Error handling with caching
@@ -335,57 +364,69 @@ def test_integration():
 def test_performance():
     """Test performance improvements"""
     print("\n⚡ Testing Performance Improvements")
-    print("-" * 40)
+    print(SEP)
     
     try:
         from utils.cache_manager import get_cache_manager
         from utils.error_handler import error_handler
-        from concurrent.futures import ThreadPoolExecutor
-        import time
         
         cache = get_cache_manager()
         
         # Test 1: Cache performance
         print("1. Testing cache performance...")
-        start_time = time.time()
-        
-        # Set multiple cache entries
-        for i in range(100):
-            cache.set(f"perf_test_{i}", f"value_{i}", ttl=60)
-        
-        # Get multiple cache entries
-        for i in range(100):
-            cache.get(f"perf_test_{i}")
-        
-        cache_time = time.time() - start_time
-        print(f"✅ Cache operations completed in {cache_time:.3f} seconds")
+        # Keys and values are built before the timer so only cache work is measured
+        items = {f"perf_test_{i}": f"value_{i}" for i in range(100)}
+        keys = tuple(items)
+        
+        # Set and get multiple cache entries in one batch each
+        start_ns = time.monotonic_ns()
+        cache.mset(items, ttl=60)
+        values = cache.mget(keys)
+        cache_ns = time.monotonic_ns() - start_ns
+        if len(values) != 100:
+            print(f"❌ Batch get returned {len(values)} of 100 entries")
+            return False
+        
+        # The same stores and reads on a plain dict, as the floor to compare against
+        start_ns = time.monotonic_ns()
+        mirror = {}
+        mirror.update(items)
+        mirror_values = {key: mirror[key] for key in keys}
+        mirror_ns = max(time.monotonic_ns() - start_ns, 1)
+        if mirror_values != values:
+            print("❌ Cache contents differ from the dict mirror")
+            return False
+        
+        print(f"✅ Cache operations completed in {cache_ns / 1e9:.3f} seconds "
+              f"({cache_ns / mirror_ns:.1f}x a plain dict)")
         
         # Test 2: Error handling performance
         print("\n2. Testing error handling performance...")
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
         # Generate multiple errors
         for i in range(50):
             error = Exception(f"Performance test error {i}")
             error_handler.handle_error(error, {"test": i})
         
-        error_time = time.time() - start_time
+        error_time = (time.monotonic_ns() - start_ns) / 1e9
         print(f"✅ Error handling completed in {error_time:.3f} seconds")
         
         # Test 3: Concurrent operations
         print("\n3. Testing concurrent operations...")
         def cache_worker(worker_id):
-            for i in range(10):
-                cache.set(f"concurrent_{worker_id}_{i}", f"value_{i}", ttl=60)
-                cache.get(f"concurrent_{worker_id}_{i}")
+            # Tuple keys are built once, outside the set/get loop
+            entries = [(("concurrent", worker_id, i), f"value_{i}") for i in range(10)]
+            for key, value in entries:
+                cache.set(key, value, ttl=60)
+                cache.get(key)
             return f"Worker {worker_id} completed"
         
-        start_time = time.time()
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(cache_worker, i) for i in range(5)]
-            results = [future.result() for future in futures]
+        start_ns = time.monotonic_ns()
+        futures = [_executor().submit(cache_worker, i) for i in range(5)]
+        results = [future.result() for future in futures]
         
-        concurrent_time = time.time() - start_time
+        concurrent_time = (time.monotonic_ns() - start_ns) / 1e9
         print(f"✅ Concurrent operations completed in {concurrent_time:.3f} seconds")
         
         print("\n✅ All performance tests passed!")
@@ -395,6 +436,27 @@ def test_performance():
         print(f"❌ Performance test failed: {e}")
         return False
 
+class _SuiteOutput:
+    """Stand-in for sys.stdout that sends each suite thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffers = {}
+    
+    def write(self, text):
+        return self.buffers.get(threading.get_ident(), self.stream).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def _run_buffered(output, test_func):
+    """Run one suite with its prints captured; returns (passed, output text)"""
+    buffer = output.buffers[threading.get_ident()] = io.StringIO()
+    try:
+        return test_func(), buffer.getvalue()
+    finally:
+        del output.buffers[threading.get_ident()]
+
 def main():
     """Run all tests"""
     print("🚀 LeadFinder Improvements Test Suite")
@@ -412,11 +474,28 @@ def main():
     passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
+    # Independent suites run concurrently; their output is shown in suite order
+    output = _SuiteOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        futures = [(test_name, _executor().submit(_run_buffered, output, test_func))
+                   for test_name, test_func in tests[:INDEPENDENT_SUITES]]
+        for test_name, future in futures:
+            test_passed, text = future.result()
+            print(f"\n🧪 Running {test_name} tests...")
+            print(text, end="")
+            if test_passed:
+                passed += 1
+            print(SEP)
+    finally:
+        sys.stdout = output.stream
+    
+    # Integration and performance run afterwards against the warmed-up systems
+    for test_name, test_func in tests[INDEPENDENT_SUITES:]:
         print(f"\n🧪 Running {test_name} tests...")
         if test_func():
             passed += 1
-        print("-" * 40)
+        print(SEP)
     
     print(f"\n📊 Test Results: {passed}/{total} test suites passed")
     
@@ -4,8 +4,6 @@ Test script to verify LeadFinder improvements integration
 """
 
 import sys
-import os
-from pathlib import Path
 
 def test_imports():
     """Test that all improvement modules can be imported"""
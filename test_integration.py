@@ -3,7 +3,6 @@
 Test script for local AutoGPT integration with Leadfinder app using Ollama
 """
 
-import json
 import sys
 from autogpt_client import LocalAutoGPTClient, AutoGPTConfig
 from leadfinder_autogpt_integration import LeadfinderAutoGPTIntegration
@@ -1,9 +1,10 @@
 """
 Unit tests for database module.
 """
+import sqlite3
 import pytest
 from unittest.mock import patch, MagicMock
-from models.database import DatabaseConnection, get_all_leads, save_lead, delete_lead
+from models.database import db, DatabaseConnection, get_all_leads, save_lead, save_leads_bulk, delete_lead, get_leads_by_ids, get_stats_bundle, get_stats_version
 
 
 class TestDatabaseConnection:
@@ -77,4 +78,81 @@ class TestLeadOperations:
             
             # Verify it's gone
             leads = get_all_leads()
-            assert len([l for l in leads if l['id'] == lead_id]) == 0 
\ No newline at end of file
+            assert len([l for l in leads if l['id'] == lead_id]) == 0 
+    
+    def test_save_leads_bulk(self, temp_db):
+        """Test saving several leads in one call."""
+        with patch('models.database.DATABASE_PATH', temp_db):
+            leads = [
+                {'title': 'Bulk Lead 1', 'description': 'First', 'link': 'https://example.com/1',
+                 'ai_summary': '', 'source': 'test_bulk'},
+                {'title': 'Bulk Lead 2', 'description': 'Second', 'link': 'https://example.com/2',
+                 'ai_summary': '', 'source': 'test_bulk'}
+            ]
+            
+            inserted = save_leads_bulk(leads)
+            assert inserted == 2
+            
+            titles = [l['title'] for l in get_all_leads()]
+            assert 'Bulk Lead 1' in titles
+            assert 'Bulk Lead 2' in titles
+    
+    def test_save_leads_bulk_is_atomic(self, temp_db):
+        """Test that a failing row leaves none of its batch behind."""
+        with patch('models.database.DATABASE_PATH', temp_db):
+            leads = [
+                {'title': 'Atomic Lead 1', 'description': 'First', 'link': 'https://example.com/a1',
+                 'ai_summary': '', 'source': 'test_atomic'},
+                {'title': 'Atomic Lead 2', 'description': {'unsupported': 'type'}, 'link': 'https://example.com/a2',
+                 'ai_summary': '', 'source': 'test_atomic'}
+            ]
+            
+            with pytest.raises(sqlite3.Error):
+                save_leads_bulk(leads)
+            
+            assert not [l for l in get_all_leads() if l['source'] == 'test_atomic']
+    
+    def test_save_leads_bulk_empty(self, temp_db):
+        """Test that an empty batch is a no-op."""
+        with patch('models.database.DATABASE_PATH', temp_db):
+            assert save_leads_bulk([]) == 0
+    
+    def test_get_leads_by_ids(self, temp_db):
+        """Test fetching several leads by ID in the requested order."""
+        with patch('models.database.DATABASE_PATH', temp_db):
+            save_leads_bulk([
+                {'title': 'By ID 1', 'description': '', 'link': '', 'ai_summary': '', 'source': 'test_ids'},
+                {'title': 'By ID 2', 'description': '', 'link': '', 'ai_summary': '', 'source': 'test_ids'}
+            ])
+            ids = [l['id'] for l in get_all_leads() if l['source'] == 'test_ids'][:2]
+            
+            leads = get_leads_by_ids(list(reversed(ids)) + [-1])
+            assert [l['id'] for l in leads] == list(reversed(ids))
+    
+    def test_stats_version_changes_on_insert(self, temp_db):
+        """Test that the stats version token changes when a lead is added."""
+        with patch('models.database.DATABASE_PATH', temp_db):
+            before = get_stats_version()
+            save_lead('Version Lead', 'Description', 'https://example.com/v', '', 'test_version')
+            assert get_stats_version() != before
+    
+    def test_get_stats_bundle(self, temp_db):
+        """Test that the stats bundle returns all dashboard totals."""
+        with patch('models.database.DATABASE_PATH', temp_db):
+            before = get_stats_bundle()['total_leads']
+            save_lead('Bundle Lead', 'Description', 'https://example.com/b', 'Summary', 'test_bundle')
+            
+            stats = get_stats_bundle()
+            assert stats['total_leads'] == before + 1
+            for key in ('ai_analyses', 'total_searches', 'total_chunks', 'total_documents', 'total_sessions'):
+                assert key in stats
+    
+    def test_rollback_scope_discards_writes(self, temp_db):
+        """Test that writes made inside a rollback scope are not kept."""
+        with patch('models.database.DATABASE_PATH', temp_db):
+            before = db.get_lead_count()
+            with db.rollback_scope('test_scope') as scoped_db:
+                scoped_db.save_lead('Scoped Lead', 'Description', 'https://example.com/s', '', 'test_scope')
+                assert scoped_db.get_lead_count() == before + 1
+            
+            assert db.get_lead_count() == before
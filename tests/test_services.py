@@ -2,11 +2,13 @@
 Comprehensive unit tests for LeadFinder services
 """
 import pytest
+import asyncio
+import json
 import tempfile
 import os
 import sys
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from typing import Dict, Any, List
 
 # Add project root to path
@@ -29,7 +31,7 @@ try:
     from services.cordis_api import CORDISAPI
     from services.nih_api import NIHAPI
     from services.nsf_api import NSFAPI
-    from services.webscraper_service import WebScraperService
+    from services.webscraper_service import WebScraperService, BrowserPool, get_browser_pool
     from services.pdf_service import PDFService
     from services.markdown_service import MarkdownService
     from services.langchain_analyzer import LangChainAnalyzer
@@ -38,6 +40,7 @@ try:
     from services.runpod_service import RunPodService
     from services.name_extraction_service import NameExtractionService
     from services.suppai_service import SuppAIService
+    from services.llm_cache import LLMCache
 except ImportError as e:
     pytest.skip(f"Services not available: {e}", allow_module_level=True)
 
@@ -451,6 +454,190 @@ class TestAPIServices:
         results = pubmed_service.search_articles("epigenetics", max_results=1)
         assert isinstance(results, list)
 
+class TestBrowserPool:
+    """Test browser page pool checkout and release"""
+    
+    @staticmethod
+    def _start_pool(size, clear_cookies_error=None, pool=None):
+        """Start a BrowserPool (a new one unless given) on a fake Playwright browser; returns (pool, browser)"""
+        def new_context(**kwargs):
+            context = MagicMock()
+            context.route = AsyncMock()
+            context.close = AsyncMock()
+            context.clear_cookies = AsyncMock(side_effect=clear_cookies_error)
+            page = MagicMock()
+            page.context = context
+            context.new_page = AsyncMock(return_value=page)
+            return context
+        
+        browser = MagicMock()
+        browser.new_context = AsyncMock(side_effect=new_context)
+        browser.close = AsyncMock()
+        playwright = MagicMock()
+        playwright.chromium.launch = AsyncMock(return_value=browser)
+        playwright.stop = AsyncMock()
+        starter = MagicMock()
+        starter.start = AsyncMock(return_value=playwright)
+        
+        pool = pool or BrowserPool(size=size)
+        
+        async def start():
+            with patch('services.webscraper_service.async_playwright', return_value=starter, create=True):
+                await pool.start()
+            return pool, browser
+        return start()
+    
+    def test_failed_release_wakes_waiter(self):
+        """Test that a context dropped on release is replaced for a pending acquire"""
+        async def scenario():
+            pool, browser = await self._start_pool(1, clear_cookies_error=Exception("context crashed"))
+            page = await pool.acquire()
+            waiter = asyncio.ensure_future(pool.acquire())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+            
+            await pool.release(page)
+            replacement = await asyncio.wait_for(waiter, timeout=1)
+            assert replacement is not page
+            assert browser.new_context.await_count == 2
+            await pool.close()
+        
+        asyncio.run(scenario())
+    
+    def test_close_fails_pending_acquires(self):
+        """Test that close() does not leave acquire() waiters hanging"""
+        async def scenario():
+            pool, _ = await self._start_pool(1)
+            page = await pool.acquire()
+            waiters = [asyncio.ensure_future(pool.acquire()) for _ in range(3)]
+            await asyncio.sleep(0)
+            
+            await pool.close()
+            results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=1)
+            assert all(isinstance(result, RuntimeError) for result in results)
+            await pool.release(page)
+        
+        asyncio.run(scenario())
+    
+    def test_shared_pool_is_per_event_loop(self):
+        """Test that a pool started under one asyncio.run() is not reused by the next"""
+        async def shared_pool():
+            pool = get_browser_pool(size=1)
+            if not pool.is_running:
+                await self._start_pool(1, pool=pool)
+            return pool
+        
+        with patch('services.webscraper_service._browser_pool', None):
+            first = asyncio.run(shared_pool())
+            second = asyncio.run(shared_pool())
+        assert second is not first
+        assert second.loop is not first.loop
+
+class TestDataProcessService:
+    """Test workflow lead scoring"""
+    
+    def test_batch_scoring_skips_malformed_recommendations(self):
+        """Test that bad entries in a batch reply don't fail the whole lead analysis"""
+        from services.workflow_service import DataProcessService
+        
+        batch_reply = json.dumps([
+            {'id': 1, 'score': 7, 'assessment': 'Good fit', 'recommendations': 5},
+            {'id': 2, 'score': 4, 'assessment': 'Weak fit', 'recommendations': 'Call them'},
+            {'score': 9, 'assessment': 'No id'}
+        ])
+        replies = [batch_reply, "Score: 8\nRecommend contacting the lab"]
+        leads = [{'id': n, 'title': f'Lead {n}', 'description': 'Epigenetics research'} for n in (1, 2, 3)]
+        
+        with patch('services.workflow_service.ollama_service', Mock()), \
+             patch('services.workflow_service.cached_generate_text', side_effect=replies):
+            result = DataProcessService()._lead_analysis(leads)
+        
+        assert 'error' not in result
+        scored = {lead['id']: lead for lead in result['leads']}
+        assert (scored[1]['score'], scored[1]['recommendations']) == (7, [])
+        assert (scored[2]['score'], scored[2]['recommendations']) == (4, [])
+        # Lead 3 has no usable batch entry, so it is scored on its own
+        assert scored[3]['score'] == 8
+        assert scored[3]['recommendations'] == ['Recommend contacting the lab']
+
+class TestDataWorkflow:
+    """Test the workflow manager"""
+    
+    def test_collect_data_multi_stays_running_until_all_sources_finish(self):
+        """Test that a fast source does not mark data_in completed while others run"""
+        import threading
+        import time
+        from services.workflow_service import DataWorkflow
+        
+        release_research = threading.Event()
+        
+        def research_search(query, **kwargs):
+            release_research.wait(timeout=5)
+            return {'success': True, 'results': [{'title': 'Grant'}]}
+        
+        workflow = DataWorkflow()
+        workflow.data_in = Mock()
+        workflow.data_in.quick_search.return_value = {'success': True, 'results': [{'title': 'Page'}]}
+        workflow.data_in.research_search.side_effect = research_search
+        
+        results = {}
+        collecting = threading.Thread(
+            target=lambda: results.update(workflow.collect_data_multi(['web_search', 'research_apis'], 'epigenetics'))
+        )
+        collecting.start()
+        try:
+            # Wait for the web search to finish while the research search is held back
+            for _ in range(100):
+                if workflow.get_progress()['data_in']['progress'] > 0:
+                    break
+                time.sleep(0.01)
+            assert workflow.get_progress()['data_in'] == {'status': 'running', 'progress': 50}
+        finally:
+            release_research.set()
+            collecting.join(timeout=5)
+        
+        assert results['sources_succeeded'] == 2
+        assert workflow.get_progress()['data_in'] == {'status': 'completed', 'progress': 100}
+
+class TestLLMCache:
+    """Test LLM response cache"""
+    
+    @pytest.fixture
+    def generate(self):
+        """Mock text generation function"""
+        return Mock(side_effect=lambda prompt: f"response to {prompt}")
+    
+    def test_repeated_prompt_hits_cache(self, generate):
+        """Test that identical prompts call the model once"""
+        cache = LLMCache(generate, lambda: 'mistral:latest', use_redis=False)
+        
+        assert cache("prompt") == "response to prompt"
+        assert cache("prompt") == "response to prompt"
+        assert generate.call_count == 1
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+    
+    def test_model_change_misses_cache(self, generate):
+        """Test that the model name is part of the cache key"""
+        model = {'name': 'mistral:latest'}
+        cache = LLMCache(generate, lambda: model['name'], use_redis=False)
+        
+        cache("prompt")
+        model['name'] = 'deepseek-coder:latest'
+        cache("prompt")
+        assert generate.call_count == 2
+    
+    def test_error_responses_not_cached(self):
+        """Test that error text from the service is not cached"""
+        generate = Mock(return_value="AI service timeout - please try again")
+        cache = LLMCache(generate, use_redis=False)
+        
+        cache("prompt")
+        cache("prompt")
+        assert generate.call_count == 2
+
 class TestUtilityServices:
     """Test utility services"""
     
@@ -481,6 +668,24 @@ class TestUtilityServices:
         value = cache_manager.get("expire_key")
         assert value is None
     
+    def test_cached_keys_are_typed(self):
+        """Test that equal arguments of different types are cached separately"""
+        from utils.cache_manager import cached
+        
+        @cached(ttl=60, key_prefix="test_typed")
+        def describe(value):
+            return type(value).__name__
+        
+        @cached(ttl=60, key_prefix="test_typed")
+        def describe_args(*values):
+            return type(values[0]).__name__
+        
+        for func in (describe, describe_args):
+            assert func(1) == 'int'
+            assert func(1.0) == 'float'
+            assert func(True) == 'bool'
+            assert func(1) == 'int'
+    
     def test_health_monitor(self, health_monitor):
         """Test health monitor functionality"""
         status = health_monitor.get_health_status()
@@ -0,0 +1,69 @@
+"""
+Low-contention counters for hot statistics paths
+"""
+
+import threading
+import weakref
+
+class _CellOwner:
+    """Per-thread marker; its collection when the thread exits retires the thread's cell"""
+    
+    __slots__ = ('__weakref__',)
+
+def _retire_cell(lock, cells, base, cell):
+    """Fold a finished thread's cell into the base total and drop it"""
+    with lock:
+        base[0] += cell[0]
+        del cells[id(cell)]
+
+class ShardedCounter:
+    """
+    Counter with one cell per live thread
+    
+    inc() only ever touches the calling thread's own cell, so increments need
+    no lock and cannot be lost; sum() adds the cells up on demand. Each cell
+    is a separate small list rather than a slot in one shared array, so
+    threads do not keep writing into the same object. When a thread exits its
+    cell is folded into a base total, so short-lived threads do not leave
+    cells behind.
+    """
+    
+    __slots__ = ('_cells', '_base', '_local', '_lock')
+    
+    def __init__(self):
+        self._cells = {}
+        self._base = [0]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def _new_cell(self) -> list:
+        """Create and register the calling thread's cell"""
+        cell = [0]
+        owner = _CellOwner()
+        with self._lock:
+            self._cells[id(cell)] = cell
+        # threading.local drops owner when this thread exits, which retires the cell
+        weakref.finalize(owner, _retire_cell, self._lock, self._cells, self._base, cell).atexit = False
+        self._local.owner = owner
+        self._local.cell = cell
+        return cell
+    
+    def inc(self, amount: int = 1):
+        """Add amount to the counter"""
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        cell[0] += amount
+    
+    def sum(self) -> int:
+        """Current total across all threads"""
+        with self._lock:
+            return self._base[0] + sum(cell[0] for cell in self._cells.values())
+    
+    def reset(self):
+        """Set the counter back to zero"""
+        with self._lock:
+            self._base[0] = 0
+            for cell in self._cells.values():
+                cell[0] = 0
@@ -13,6 +13,7 @@ This module provides a robust caching system with:
 import time
 import threading
 import hashlib
+import inspect
 import json
 from typing import Any, Dict, Optional, Callable, Union
 from datetime import datetime, timedelta
@@ -26,32 +27,78 @@ except ImportError:
     logger = None
 
 class CacheEntry:
-    """Represents a single cache entry"""
+    """
+    Represents a single cache entry
+    
+    Times are time.monotonic() readings, so expiry is immune to wall-clock
+    changes; the absolute expiry is computed once so a lookup needs a single
+    comparison.
+    """
     
-    def __init__(self, key: str, value: Any, ttl: int = 300):
+    __slots__ = ('key', 'value', 'ttl', 'created_at', 'expires_at', 'last_accessed', 'access_count')
+    
+    def __init__(self, key: str, value: Any, ttl: int = 300, now: Optional[float] = None):
+        if now is None:
+            now = time.monotonic()
         self.key = key
         self.value = value
-        self.created_at = time.time()
-        self.last_accessed = time.time()
-        self.access_count = 0
         self.ttl = ttl  # Time to live in seconds
+        self.created_at = now
+        self.expires_at = now + ttl
+        self.last_accessed = now
+        self.access_count = 0
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if the cache entry has expired"""
-        return time.time() - self.created_at > self.ttl
+        return (time.monotonic() if now is None else now) > self.expires_at
     
-    def access(self):
+    def access(self, now: Optional[float] = None):
         """Mark the entry as accessed"""
-        self.last_accessed = time.time()
+        self.last_accessed = time.monotonic() if now is None else now
         self.access_count += 1
     
     def get_age(self) -> float:
         """Get the age of the entry in seconds"""
-        return time.time() - self.created_at
+        return time.monotonic() - self.created_at
     
     def get_remaining_ttl(self) -> float:
         """Get remaining TTL in seconds"""
-        return max(0, self.ttl - self.get_age())
+        return max(0, self.expires_at - time.monotonic())
+
+def _monotonic_to_datetime(reading: float) -> datetime:
+    """Convert a time.monotonic() reading to wall-clock time"""
+    return datetime.fromtimestamp(time.time() - (time.monotonic() - reading))
+
+def _key_text(key: Any) -> str:
+    """
+    Text that invalidate_pattern() matches against: string keys as-is, tuple
+    keys (as made by @cached) by their leading string item, otherwise nothing
+    """
+    if isinstance(key, str):
+        return key
+    if isinstance(key, tuple) and key and isinstance(key[0], str):
+        return key[0]
+    return ""
+
+# Statistics kept per segment and summed in get_stats()
+STAT_NAMES = ('hits', 'misses', 'sets', 'deletes', 'expired', 'evicted')
+
+class _Segment:
+    """
+    One shard of the cache: an LRU-ordered dict, its lock and its statistics
+    
+    Not padded against false sharing: the lock is a separate heap object, so
+    padding slots here would not move it, and the dicts allocated between
+    segments' locks already keep consecutive locks more than a cache line apart.
+    """
+    
+    __slots__ = ('entries', 'lock', 'max_size', 'stats')
+    
+    def __init__(self, max_size: int):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.max_size = max_size
+        self.stats = dict.fromkeys(STAT_NAMES, 0)
 
 class CacheManager:
     """
@@ -63,8 +110,14 @@ class CacheManager:
     - Cache statistics and monitoring
     - Automatic cleanup of expired entries
     - Thread-safe operations
+    
+    Entries are spread over up to SEGMENTS shards by key hash, each with its
+    own lock, so operations on different keys rarely wait for each other.
+    LRU eviction is applied within a shard.
     """
     
+    SEGMENTS = 16
+    
     def __init__(self, max_size: int = 1000, default_ttl: int = 300, cleanup_interval: int = 60):
         """
         Initialize the cache manager
@@ -78,19 +131,15 @@ class CacheManager:
         self.default_ttl = default_ttl
         self.cleanup_interval = cleanup_interval
         
-        # Thread-safe cache storage
-        self._cache = OrderedDict()
-        self._lock = threading.RLock()
+        # Power-of-two segment count (so the index is a mask) with no more segments than entries
+        segment_count = 1
+        while segment_count < self.SEGMENTS and segment_count * 2 <= max_size:
+            segment_count *= 2
+        self._segment_mask = segment_count - 1
         
-        # Statistics
-        self._stats = {
-            'hits': 0,
-            'misses': 0,
-            'sets': 0,
-            'deletes': 0,
-            'expired': 0,
-            'evicted': 0
-        }
+        # Split max_size across segments so the capacities add up exactly
+        base, extra = divmod(max_size, segment_count)
+        self._segments = [_Segment(base + (1 if i < extra else 0)) for i in range(segment_count)]
         
         # Start cleanup thread
         self._cleanup_thread = None
@@ -98,7 +147,12 @@ class CacheManager:
         self._start_cleanup_thread()
         
         if logger:
-            logger.info(f"Cache manager initialized with max_size={max_size}, default_ttl={default_ttl}s")
+            logger.info(f"Cache manager initialized with max_size={max_size}, default_ttl={default_ttl}s, "
+                        f"segments={segment_count}")
+    
+    def _segment(self, key: str) -> _Segment:
+        """Return the segment that owns key"""
+        return self._segments[hash(key) & self._segment_mask]
     
     def _start_cleanup_thread(self):
         """Start the cleanup thread"""
@@ -116,26 +170,25 @@ class CacheManager:
     
     def _cleanup_expired(self):
         """Remove expired entries from cache"""
-        with self._lock:
-            expired_keys = []
-            for key, entry in self._cache.items():
-                if entry.is_expired():
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self._cache[key]
-                self._stats['expired'] += 1
-            
-            if expired_keys and logger:
-                logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+        total_expired = 0
+        for segment in self._segments:
+            now = time.monotonic()
+            with segment.lock:
+                expired_keys = [key for key, entry in segment.entries.items() if now > entry.expires_at]
+                for key in expired_keys:
+                    del segment.entries[key]
+                segment.stats['expired'] += len(expired_keys)
+                total_expired += len(expired_keys)
+        
+        if total_expired and logger:
+            logger.debug(f"Cleaned up {total_expired} expired cache entries")
     
-    def _evict_lru(self):
-        """Evict least recently used entry"""
-        if self._cache:
+    def _evict_lru(self, segment: _Segment):
+        """Evict the least recently used entry of a segment; caller holds its lock"""
+        if segment.entries:
             # Remove the oldest entry (first in OrderedDict)
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-            self._stats['evicted'] += 1
+            oldest_key, _ = segment.entries.popitem(last=False)
+            segment.stats['evicted'] += 1
             
             if logger:
                 logger.debug(f"Evicted cache entry: {oldest_key}")
@@ -151,57 +204,128 @@ class CacheManager:
         Get a value from cache
         
         Args:
-            key: Cache key
+            key: Cache key (a string or any hashable, e.g. a tuple)
             default: Default value if key not found
             
         Returns:
             Cached value or default
         """
-        with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                
-                if entry.is_expired():
-                    # Remove expired entry
-                    del self._cache[key]
-                    self._stats['expired'] += 1
-                    self._stats['misses'] += 1
-                    return default
-                
-                # Mark as accessed and move to end (LRU)
-                entry.access()
-                self._cache.move_to_end(key)
-                self._stats['hits'] += 1
-                return entry.value
-            else:
-                self._stats['misses'] += 1
+        segment = self._segment(key)
+        now = time.monotonic()
+        with segment.lock:
+            # One dict lookup; expiry is a single comparison against the stored deadline
+            entry = segment.entries.get(key)
+            if entry is None:
+                segment.stats['misses'] += 1
                 return default
+            
+            if now > entry.expires_at:
+                # Remove expired entry
+                del segment.entries[key]
+                segment.stats['expired'] += 1
+                segment.stats['misses'] += 1
+                return default
+            
+            # Mark as accessed and move to end (LRU)
+            entry.last_accessed = now
+            entry.access_count += 1
+            segment.entries.move_to_end(key)
+            segment.stats['hits'] += 1
+            return entry.value
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """
         Set a value in cache
         
         Args:
-            key: Cache key
+            key: Cache key (a string or any hashable, e.g. a tuple)
             value: Value to cache
             ttl: Time to live in seconds (uses default if None)
             
         Returns:
             True if successful
         """
-        with self._lock:
-            # Evict if cache is full
-            if len(self._cache) >= self.max_size and key not in self._cache:
-                self._evict_lru()
+        segment = self._segment(key)
+        entry = CacheEntry(key, value, ttl or self.default_ttl)
+        with segment.lock:
+            # Evict if the segment is full
+            if len(segment.entries) >= segment.max_size and key not in segment.entries:
+                self._evict_lru(segment)
             
-            # Create cache entry
-            entry = CacheEntry(key, value, ttl or self.default_ttl)
-            self._cache[key] = entry
-            self._cache.move_to_end(key)  # Move to end (LRU)
-            self._stats['sets'] += 1
+            # Store the cache entry
+            segment.entries[key] = entry
+            segment.entries.move_to_end(key)  # Move to end (LRU)
+            segment.stats['sets'] += 1
             
             return True
     
+    def mset(self, items: Dict[str, Any], ttl: Optional[int] = None) -> int:
+        """
+        Set several values, taking each segment lock once
+        
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds (uses default if None)
+        
+        Returns:
+            Number of entries stored
+        """
+        ttl = ttl or self.default_ttl
+        now = time.monotonic()
+        groups = {}
+        mask = self._segment_mask
+        for key, value in items.items():
+            groups.setdefault(hash(key) & mask, []).append(CacheEntry(key, value, ttl, now))
+        
+        for index, entries in groups.items():
+            segment = self._segments[index]
+            with segment.lock:
+                for entry in entries:
+                    if len(segment.entries) >= segment.max_size and entry.key not in segment.entries:
+                        self._evict_lru(segment)
+                    segment.entries[entry.key] = entry
+                    segment.entries.move_to_end(entry.key)
+                segment.stats['sets'] += len(entries)
+        return len(items)
+    
+    def mget(self, keys) -> Dict[str, Any]:
+        """
+        Get several values, taking each segment lock once
+        
+        Args:
+            keys: Iterable of cache keys
+        
+        Returns:
+            Dictionary of the keys that were found and not expired
+        """
+        groups = {}
+        mask = self._segment_mask
+        for key in keys:
+            groups.setdefault(hash(key) & mask, []).append(key)
+        
+        found = {}
+        now = time.monotonic()
+        for index, segment_keys in groups.items():
+            segment = self._segments[index]
+            with segment.lock:
+                entries = segment.entries
+                stats = segment.stats
+                for key in segment_keys:
+                    entry = entries.get(key)
+                    if entry is None:
+                        stats['misses'] += 1
+                    elif now > entry.expires_at:
+                        del entries[key]
+                        stats['expired'] += 1
+                        stats['misses'] += 1
+                    else:
+                        entry.last_accessed = now
+                        entry.access_count += 1
+                        entries.move_to_end(key)
+                        stats['hits'] += 1
+                        found[key] = entry.value
+        return found
+    
     def delete(self, key: str) -> bool:
         """
         Delete a value from cache
@@ -212,60 +336,70 @@ class CacheManager:
         Returns:
             True if key was found and deleted
         """
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                self._stats['deletes'] += 1
+        segment = self._segment(key)
+        with segment.lock:
+            if segment.entries.pop(key, None) is not None:
+                segment.stats['deletes'] += 1
                 return True
             return False
     
     def clear(self):
         """Clear all cache entries"""
-        with self._lock:
-            self._cache.clear()
-            if logger:
-                logger.info("Cache cleared")
+        for segment in self._segments:
+            with segment.lock:
+                segment.entries.clear()
+        if logger:
+            logger.info("Cache cleared")
     
     def exists(self, key: str) -> bool:
         """Check if a key exists in cache and is not expired"""
-        with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                if entry.is_expired():
-                    del self._cache[key]
-                    self._stats['expired'] += 1
-                    return False
-                return True
-            return False
+        segment = self._segment(key)
+        with segment.lock:
+            entry = segment.entries.get(key)
+            if entry is None:
+                return False
+            if entry.is_expired():
+                del segment.entries[key]
+                segment.stats['expired'] += 1
+                return False
+            return True
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        with self._lock:
-            total_requests = self._stats['hits'] + self._stats['misses']
-            hit_rate = (self._stats['hits'] / total_requests * 100) if total_requests > 0 else 0
-            
-            return {
-                'size': len(self._cache),
-                'max_size': self.max_size,
-                'hits': self._stats['hits'],
-                'misses': self._stats['misses'],
-                'sets': self._stats['sets'],
-                'deletes': self._stats['deletes'],
-                'expired': self._stats['expired'],
-                'evicted': self._stats['evicted'],
-                'hit_rate': round(hit_rate, 2),
-                'total_requests': total_requests
-            }
+        totals = dict.fromkeys(STAT_NAMES, 0)
+        size = 0
+        for segment in self._segments:
+            with segment.lock:
+                size += len(segment.entries)
+                for name, count in segment.stats.items():
+                    totals[name] += count
+        
+        total_requests = totals['hits'] + totals['misses']
+        hit_rate = (totals['hits'] / total_requests * 100) if total_requests > 0 else 0
+        
+        return {
+            'size': size,
+            'max_size': self.max_size,
+            'hits': totals['hits'],
+            'misses': totals['misses'],
+            'sets': totals['sets'],
+            'deletes': totals['deletes'],
+            'expired': totals['expired'],
+            'evicted': totals['evicted'],
+            'hit_rate': round(hit_rate, 2),
+            'total_requests': total_requests
+        }
     
     def get_entry_info(self, key: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a cache entry"""
-        with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
+        segment = self._segment(key)
+        with segment.lock:
+            entry = segment.entries.get(key)
+            if entry is not None:
                 return {
                     'key': entry.key,
-                    'created_at': datetime.fromtimestamp(entry.created_at).isoformat(),
-                    'last_accessed': datetime.fromtimestamp(entry.last_accessed).isoformat(),
+                    'created_at': _monotonic_to_datetime(entry.created_at).isoformat(),
+                    'last_accessed': _monotonic_to_datetime(entry.last_accessed).isoformat(),
                     'access_count': entry.access_count,
                     'ttl': entry.ttl,
                     'age': round(entry.get_age(), 2),
@@ -277,8 +411,11 @@ class CacheManager:
     
     def get_all_keys(self) -> list:
         """Get all cache keys"""
-        with self._lock:
-            return list(self._cache.keys())
+        keys = []
+        for segment in self._segments:
+            with segment.lock:
+                keys.extend(segment.entries.keys())
+        return keys
     
     def invalidate_pattern(self, pattern: str) -> int:
         """
@@ -290,16 +427,19 @@ class CacheManager:
         Returns:
             Number of entries invalidated
         """
-        with self._lock:
-            keys_to_delete = [key for key in self._cache.keys() if pattern in key]
-            for key in keys_to_delete:
-                del self._cache[key]
-                self._stats['deletes'] += 1
-            
-            if logger:
-                logger.info(f"Invalidated {len(keys_to_delete)} cache entries matching pattern: {pattern}")
-            
-            return len(keys_to_delete)
+        invalidated = 0
+        for segment in self._segments:
+            with segment.lock:
+                keys_to_delete = [key for key in segment.entries if pattern in _key_text(key)]
+                for key in keys_to_delete:
+                    del segment.entries[key]
+                segment.stats['deletes'] += len(keys_to_delete)
+                invalidated += len(keys_to_delete)
+        
+        if logger:
+            logger.info(f"Invalidated {invalidated} cache entries matching pattern: {pattern}")
+        
+        return invalidated
     
     def stop(self):
         """Stop the cache manager and cleanup thread"""
@@ -311,47 +451,117 @@ class CacheManager:
 
 # Global cache instance
 _cache_manager = None
+_cache_manager_lock = threading.Lock()
 
 def get_cache_manager() -> CacheManager:
     """Get the global cache manager instance"""
     global _cache_manager
     if _cache_manager is None:
-        _cache_manager = CacheManager()
+        # Checked again under the lock so concurrent first calls create a single instance
+        with _cache_manager_lock:
+            if _cache_manager is None:
+                _cache_manager = CacheManager()
     return _cache_manager
 
 def stop_cache_manager():
     """Stop the global cache manager"""
     global _cache_manager
-    if _cache_manager:
-        _cache_manager.stop()
-        _cache_manager = None
+    with _cache_manager_lock:
+        cache_manager, _cache_manager = _cache_manager, None
+    if cache_manager:
+        cache_manager.stop()
+
+# Returned by CacheManager.get() on a miss, so cached functions may return None
+_MISS = object()
+
+def _compile_key_builder(key_head: str, func: Callable) -> Optional[Callable]:
+    """
+    Generate a function with func's signature that returns (key_head, *bound arguments, *their types)
+    
+    Binding by signature means positional and keyword spellings of the same
+    call share a key, and no kwargs sorting is needed per call. The argument
+    types are part of the key, as with lru_cache(typed=True), so equal values
+    of different types such as 1, 1.0 and True are cached separately. Returns
+    None for signatures this cannot express (*args, **kwargs, or no signature).
+    """
+    try:
+        parameters = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return None
+    
+    namespace = {'_cached_key_head': key_head, '_cached_type': type}
+    params_src = []
+    positional_only = False
+    keyword_only = False
+    for index, param in enumerate(parameters):
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD) or param.name.startswith('_cached_'):
+            return None
+        if param.kind == param.POSITIONAL_ONLY:
+            positional_only = True
+        elif positional_only:
+            params_src.append('/')
+            positional_only = False
+        if param.kind == param.KEYWORD_ONLY and not keyword_only:
+            params_src.append('*')
+            keyword_only = True
+        
+        if param.default is param.empty:
+            params_src.append(param.name)
+        else:
+            namespace[f'_cached_default_{index}'] = param.default
+            params_src.append(f'{param.name}=_cached_default_{index}')
+    if positional_only:
+        params_src.append('/')
+    
+    names = ''.join(f'{param.name}, ' for param in parameters)
+    types = ''.join(f'_cached_type({param.name}), ' for param in parameters)
+    source = f"def _make_key({', '.join(params_src)}):\n    return (_cached_key_head, {names}{types})\n"
+    exec(source, namespace)
+    return namespace['_make_key']
 
 # Decorator for function caching
 def cached(ttl: int = 300, key_prefix: str = ""):
     """
     Decorator to cache function results
     
+    Keys are tuples of the "prefix:name:" head and the arguments bound to the
+    function's parameters and their types, built by a key function generated
+    once per decorated function, so a call costs no string formatting.
+    Functions taking *args/**kwargs use (head, args, arg types[, sorted
+    kwargs, kwarg types]) instead; calls with unhashable arguments fall back
+    to an MD5 string key.
+    
     Args:
         ttl: Time to live in seconds
         key_prefix: Prefix for cache keys
     """
     def decorator(func: Callable) -> Callable:
+        key_head = f"{key_prefix}:{func.__name__}:"
+        make_key = _compile_key_builder(key_head, func)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            cache = get_cache_manager()
-            
-            # Generate cache key
-            cache_key = f"{key_prefix}:{func.__name__}:{cache._generate_key(*args, **kwargs)}"
+            cache = _cache_manager or get_cache_manager()
             
-            # Try to get from cache
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
+            try:
+                if make_key is not None:
+                    key = make_key(*args, **kwargs)
+                else:
+                    key = (key_head, args, tuple(map(type, args)))
+                    if kwargs:
+                        items = tuple(sorted(kwargs.items()))
+                        key += (items, tuple(type(value) for _, value in items))
+                result = cache.get(key, _MISS)
+            except TypeError:
+                # Unhashable arguments, or a call the signature rejects (func raises it below)
+                key = key_head + cache._generate_key(*args, **kwargs)
+                result = cache.get(key, _MISS)
+            if result is not _MISS:
+                return result
             
             # Execute function and cache result
             result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            
+            cache.set(key, result, ttl)
             return result
         return wrapper
     return decorator
@@ -10,10 +10,12 @@ This module provides a centralized error handling system with:
 """
 
 import traceback
-import sys
 from typing import Dict, Any, Optional, Callable
 from functools import wraps
 from datetime import datetime
+from collections import deque, namedtuple
+from enum import IntEnum
+from itertools import islice
 import json
 
 # Flask imports for error handlers
@@ -30,9 +32,13 @@ try:
 except ImportError:
     logger = None
 
+from utils._counters import ShardedCounter
+
 # Custom Exception Classes
 class LeadFinderError(Exception):
     """Base exception class for LeadFinder application"""
+    __slots__ = ('message', 'error_code', 'details', 'timestamp', 'traceback')
+    
     def __init__(self, message: str, error_code: str = None, details: Dict[str, Any] = None):
         super().__init__(message)
         self.message = message
@@ -43,12 +49,16 @@ class LeadFinderError(Exception):
 
 class DatabaseError(LeadFinderError):
     """Database-related errors"""
+    __slots__ = ('operation',)
+    
     def __init__(self, message: str, operation: str = None, details: Dict[str, Any] = None):
         super().__init__(message, "DATABASE_ERROR", details)
         self.operation = operation
 
 class APIServiceError(LeadFinderError):
     """API service errors"""
+    __slots__ = ('service', 'endpoint')
+    
     def __init__(self, message: str, service: str = None, endpoint: str = None, details: Dict[str, Any] = None):
         super().__init__(message, "API_SERVICE_ERROR", details)
         self.service = service
@@ -140,18 +150,53 @@ ERROR_CATEGORIES = {
     }
 }
 
+class Severity(IntEnum):
+    """Error severities, usable as indexes into ErrorHandler's severity counters"""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+_SEVERITY_BY_NAME = {severity.name: severity for severity in Severity}
+
+# One entry of ErrorHandler.error_history; get_error_stats() reports them as dicts
+ErrorRecord = namedtuple('ErrorRecord', ('timestamp', 'error_code', 'message', 'severity', 'context'))
+
 class ErrorHandler:
     """Centralized error handling and monitoring"""
     
     def __init__(self):
         self.error_counts = {}
-        self.error_history = []
         self.max_history_size = 1000
+        # Bounded, so the oldest record drops off as each new one is added
+        self.error_history = deque(maxlen=self.max_history_size)
+        # Incremented on every handled error from any thread, read only for stats
+        self._total_errors = ShardedCounter()
+        # Errors per severity, indexed by Severity; sharded like _total_errors so the two agree
+        self._severity_counts = [ShardedCounter() for _ in Severity]
         self.alert_thresholds = {
             'HIGH': 5,      # Alert after 5 high severity errors
             'MEDIUM': 10,   # Alert after 10 medium severity errors
             'LOW': 20       # Alert after 20 low severity errors
         }
+        # Response fields that depend only on the error code, built once per code
+        self._response_templates = {}
+        # Logger methods pre-bound by severity; anything else logs at info
+        self._log_methods = {}
+        if logger:
+            self._log_methods = {'HIGH': logger.error, 'MEDIUM': logger.warning, 'LOW': logger.info}
+    
+    def _response_template(self, error_code: str, category_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the cached response fields for error_code"""
+        template = self._response_templates.get(error_code)
+        if template is None:
+            template = self._response_templates[error_code] = {
+                'success': False,
+                'error_code': error_code,
+                'message': category_info['user_message'],
+                'recoverable': category_info['recoverable'],
+                'retry_strategy': category_info['retry_strategy']
+            }
+        return template
     
     def handle_error(self, error: Exception, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -175,20 +220,16 @@ class ErrorHandler:
         self._log_error(error, context, category_info)
         
         # Update error counts
+        self._total_errors.inc()
+        self._severity_counts[_SEVERITY_BY_NAME.get(category_info['severity'], Severity.MEDIUM)].inc()
         self._update_error_counts(error.error_code, category_info['severity'])
         
         # Check for alerts
         self._check_alerts(error.error_code, category_info['severity'])
         
-        # Prepare response
-        response = {
-            'success': False,
-            'error_code': error.error_code,
-            'message': category_info['user_message'],
-            'recoverable': category_info['recoverable'],
-            'retry_strategy': category_info['retry_strategy'],
-            'timestamp': error.timestamp.isoformat()
-        }
+        # Prepare response from the per-code template
+        response = self._response_template(error.error_code, category_info).copy()
+        response['timestamp'] = error.timestamp.isoformat()
         
         # Add debug information in development
         if self._is_development_mode():
@@ -207,28 +248,14 @@ class ErrorHandler:
         if context:
             log_message += f" | Context: {json.dumps(context, default=str)}"
         
-        if category_info['severity'] == 'HIGH':
-            if logger:
-                logger.error(log_message, exc_info=True)
-        elif category_info['severity'] == 'MEDIUM':
-            if logger:
-                logger.warning(log_message, exc_info=True)
-        else:
-            if logger:
-                logger.info(log_message, exc_info=True)
+        if logger:
+            log = self._log_methods.get(category_info['severity'], logger.info)
+            log(log_message, exc_info=True)
         
         # Store in history
-        self.error_history.append({
-            'timestamp': error.timestamp,
-            'error_code': error.error_code,
-            'message': error.message,
-            'severity': category_info['severity'],
-            'context': context
-        })
-        
-        # Trim history if too large
-        if len(self.error_history) > self.max_history_size:
-            self.error_history = self.error_history[-self.max_history_size:]
+        self.error_history.append(ErrorRecord(
+            error.timestamp, error.error_code, error.message, category_info['severity'], context
+        ))
     
     def _update_error_counts(self, error_code: str, severity: str):
         """Update error count tracking"""
@@ -269,24 +296,23 @@ class ErrorHandler:
     def get_error_stats(self) -> Dict[str, Any]:
         """Get error statistics for monitoring"""
         return {
-            'total_errors': sum(count['count'] for count in self.error_counts.values()),
+            'total_errors': self._total_errors.sum(),
             'error_counts': self.error_counts,
-            'recent_errors': self.error_history[-10:] if self.error_history else [],
+            'recent_errors': [record._asdict() for record in reversed(list(islice(reversed(self.error_history), 10)))],
             'severity_distribution': self._get_severity_distribution()
         }
     
     def _get_severity_distribution(self) -> Dict[str, int]:
         """Get distribution of errors by severity"""
-        distribution = {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-        for error_info in self.error_counts.values():
-            severity = error_info['severity']
-            distribution[severity] += error_info['count']
-        return distribution
+        return {severity.name: self._severity_counts[severity].sum() for severity in reversed(Severity)}
     
     def clear_error_history(self):
         """Clear error history (useful for testing)"""
         self.error_history.clear()
         self.error_counts.clear()
+        self._total_errors.reset()
+        for counter in self._severity_counts:
+            counter.reset()
 
 # Global error handler instance
 error_handler = ErrorHandler()
@@ -310,22 +336,24 @@ def handle_errors(func: Callable) -> Callable:
 
 # Context manager for error handling
 class ErrorContext:
-    """Context manager for error handling with custom context"""
+    """
+    Context manager for error handling with custom context
+    
+    Holds nothing but the context dict, so entering and leaving it costs no
+    allocation or shared state; handle_error() wraps foreign exceptions.
+    """
+    
+    __slots__ = ('context',)
     
     def __init__(self, context: Dict[str, Any] = None):
         self.context = context or {}
-        self.original_excepthook = sys.excepthook
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_val is not None:
-            if isinstance(exc_val, LeadFinderError):
-                error_handler.handle_error(exc_val, self.context)
-            else:
-                error = LeadFinderError(str(exc_val))
-                error_handler.handle_error(error, self.context)
+            error_handler.handle_error(exc_val, self.context)
         return False  # Don't suppress the exception
 
 # Utility functions for common error scenarios
@@ -47,6 +47,8 @@ except ImportError:
 class HealthMetric:
     """Represents a single health metric"""
     
+    __slots__ = ('name', 'value', 'unit', 'threshold', 'timestamp')
+    
     def __init__(self, name: str, value: float, unit: str = "", threshold: float = None):
         self.name = name
         self.value = value
@@ -72,6 +74,8 @@ class HealthMetric:
 class HealthAlert:
     """Represents a health alert"""
     
+    __slots__ = ('severity', 'message', 'metric', 'value', 'timestamp', 'acknowledged')
+    
     def __init__(self, severity: str, message: str, metric: str = None, value: float = None):
         self.severity = severity  # 'info', 'warning', 'critical'
         self.message = message
@@ -91,9 +95,32 @@ class HealthAlert:
             'acknowledged': self.acknowledged
         }
 
+class _Aggregate:
+    """Running count, sum, min and max of values recorded for one metric"""
+    
+    __slots__ = ('unit', 'count', 'total', 'minimum', 'maximum')
+    
+    def __init__(self, unit: str = ""):
+        self.unit = unit
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float('inf')
+        self.maximum = float('-inf')
+    
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
 class HealthMonitor:
     """
     Comprehensive health monitoring system
+    
+    Event-level values passed to record() are aggregated in memory and turned
+    into metrics once per health check rather than stored one by one.
     """
     
     def __init__(self, max_history_size: int = 1000, check_interval: int = 30):
@@ -115,6 +142,10 @@ class HealthMonitor:
         self.current_metrics = {}
         self.current_alerts = []
         
+        # Values recorded since the last health check, by metric name
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        
         # Monitoring thread
         self._monitoring_thread = None
         self._stop_monitoring = False
@@ -162,16 +193,44 @@ class HealthMonitor:
         # Service metrics
         metrics.extend(self._get_service_metrics())
         
-        # Store metrics
+        # Event metrics recorded since the last check
+        metrics.extend(self._drain_recorded_metrics())
+        
+        # Store metrics; history keeps the metric objects and serializes them on read
         self.current_metrics = {metric.name: metric for metric in metrics}
-        self.metric_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'metrics': [metric.to_dict() for metric in metrics]
-        })
+        self.metric_history.append((datetime.now(), tuple(metrics)))
         
         # Check for alerts
         self._check_alerts(metrics)
     
+    def record(self, name: str, value: float, unit: str = ""):
+        """
+        Record one event-level value, e.g. a request's response time
+        
+        Values are only aggregated here; the next health check reports their
+        average as `name` (checked against thresholds[name]), plus
+        `name_max` and `name_count`.
+        """
+        with self._pending_lock:
+            aggregate = self._pending.get(name)
+            if aggregate is None:
+                aggregate = self._pending[name] = _Aggregate(unit)
+            aggregate.add(value)
+    
+    def _drain_recorded_metrics(self) -> List[HealthMetric]:
+        """Turn the values recorded since the last check into metrics and reset them"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        
+        metrics = []
+        for name, aggregate in pending.items():
+            metrics.append(HealthMetric(
+                name, aggregate.total / aggregate.count, aggregate.unit, self.thresholds.get(name)
+            ))
+            metrics.append(HealthMetric(f"{name}_max", aggregate.maximum, aggregate.unit))
+            metrics.append(HealthMetric(f"{name}_count", aggregate.count))
+        return metrics
+    
     def _get_system_metrics(self) -> List[HealthMetric]:
         """Get system resource metrics"""
         metrics = []
@@ -391,20 +450,22 @@ class HealthMonitor:
         cutoff_time = datetime.now() - timedelta(hours=hours)
         history = []
         
-        for record in self.metric_history:
-            record_time = datetime.fromisoformat(record['timestamp'])
+        for record_time, metrics in self.metric_history:
             if record_time >= cutoff_time:
                 if metric_name:
                     # Filter by specific metric
-                    for metric in record['metrics']:
-                        if metric['name'] == metric_name:
+                    for metric in metrics:
+                        if metric.name == metric_name:
                             history.append({
-                                'timestamp': record['timestamp'],
-                                'metric': metric
+                                'timestamp': record_time.isoformat(),
+                                'metric': metric.to_dict()
                             })
                 else:
                     # Return all metrics
-                    history.append(record)
+                    history.append({
+                        'timestamp': record_time.isoformat(),
+                        'metrics': [metric.to_dict() for metric in metrics]
+                    })
         
         return history
     
@@ -447,20 +508,25 @@ class HealthMonitor:
 
 # Global health monitor instance
 _health_monitor = None
+_health_monitor_lock = threading.Lock()
 
 def get_health_monitor() -> HealthMonitor:
     """Get the global health monitor instance"""
     global _health_monitor
     if _health_monitor is None:
-        _health_monitor = HealthMonitor()
+        # Checked again under the lock so concurrent first calls create a single instance
+        with _health_monitor_lock:
+            if _health_monitor is None:
+                _health_monitor = HealthMonitor()
     return _health_monitor
 
 def stop_health_monitor():
     """Stop the global health monitor"""
     global _health_monitor
-    if _health_monitor:
-        _health_monitor.stop()
-        _health_monitor = None
+    with _health_monitor_lock:
+        health_monitor, _health_monitor = _health_monitor, None
+    if health_monitor:
+        health_monitor.stop()
 
 # Health check endpoint helper
 def get_comprehensive_health_status() -> Dict[str, Any]: